@@ -0,0 +1,259 @@
+"""
+batch_rules.py
+
+This is a vectorized version of rules.py for stepping many games at once
+(self-play data generation, random playouts).
+N boards are held as an (N, total_pits) uint8 array of seeds, an (N, 2)
+uint8 array of scores and an (N,) array of players to move. Legal move
+masks, sowing, capture and the Grand Slam check are computed for all
+boards with a few NumPy operations per pit instead of a Python loop per
+board. Results match rules.legal_moves and rules.apply_move.
+
+NumPy is only needed by this module:
+
+    pip install numpy
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from board import Board, sow_table
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@lru_cache(maxsize=None)
+def _sow_arrays(total_pits: int) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Return board.sow_table as flat arrays indexed by pit * (max_seeds + 1) + seeds.
+
+    Args:
+        total_pits (int): Number of pits on the board.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The gain vectors (uint8, one row per entry) and
+        the last pit indices (int64).
+    """
+    table = sow_table(total_pits)
+    gains = np.array(table.deltas, dtype=np.uint8).reshape(-1, total_pits)
+    return gains, np.array(table.last, dtype=np.int64).reshape(-1)
+
+
+class BatchBoards:
+    """
+    N Oware positions advanced together.
+
+    Attributes:
+        pits_per_side (int): Pits per player.
+        total_pits (int): Number of pits on each board.
+        pits (np.ndarray): (N, total_pits) uint8 seed counts.
+        scores (np.ndarray): (N, 2) uint8 scores.
+        player (np.ndarray): (N,) uint8 player to move.
+    """
+
+    def __init__(self, n: int, pits_per_side: int = 6, initial_stones: int = 4):
+        """
+        Create N boards in the initial position, Player 0 to move.
+
+        Args:
+            n (int): Number of boards.
+            pits_per_side (int, optional): Pits per player. Defaults to 6.
+            initial_stones (int, optional): Stones per pit. Defaults to 4.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("batch_rules needs NumPy (pip install numpy).")
+        self.pits_per_side = pits_per_side
+        self.total_pits = 2 * pits_per_side
+        if initial_stones * self.total_pits > 255:
+            raise ValueError("Seed counts are stored as uint8; at most 255 seeds per board.")
+        self.pits = np.full((n, self.total_pits), initial_stones, dtype=np.uint8)
+        self.scores = np.zeros((n, 2), dtype=np.uint8)
+        self.player = np.zeros(n, dtype=np.uint8)
+        self._gains, self._last = _sow_arrays(self.total_pits)
+        self._seed_range = sow_table(self.total_pits).max_seeds + 1
+
+    @classmethod
+    def from_boards(cls, boards: List[Board], players: List[int]) -> "BatchBoards":
+        """
+        Copy Board objects into a batch.
+
+        Args:
+            boards (List[Board]): Positions of the same geometry.
+            players (List[int]): Player to move on each board.
+
+        Returns:
+            BatchBoards: The batch.
+        """
+        batch = cls(len(boards), boards[0].pits_per_side if boards else 6, 0)
+        for i, board in enumerate(boards):
+            batch.pits[i] = [p.stones for p in board.pits]
+            batch.scores[i] = board.scores
+        batch.player[:] = players
+        return batch
+
+    def to_board(self, i: int) -> Board:
+        """
+        Copy one position back into a Board.
+
+        Args:
+            i (int): Board number.
+
+        Returns:
+            Board: The position (the player to move is self.player[i]).
+        """
+        board = Board(self.pits_per_side)
+        for j, count in enumerate(self.pits[i]):
+            board.pits[j].stones = int(count)
+        board.scores = [int(s) for s in self.scores[i]]
+        board.rehash()
+        return board
+
+    def __len__(self) -> int:
+        """Return the number of boards."""
+        return len(self.pits)
+
+    def _simulate(self, pits: "np.ndarray", player: "np.ndarray",
+                  pit: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """
+        Sow and capture one move on every row (vector form of rules._simulate).
+
+        Args:
+            pits (np.ndarray): (M, total_pits) seed counts (left untouched).
+            player (np.ndarray): (M,) mover of each row.
+            pit (np.ndarray): (M,) pit sown on each row; rows with an empty pit come back unchanged.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: (Seeds after the move, seeds captured,
+            seeds left on the opponent's side).
+        """
+        pps = self.pits_per_side
+        total = self.total_pits
+        base = np.arange(len(pits)) * total
+        pits = np.ascontiguousarray(pits)
+        seeds = pits.reshape(-1).take(base + pit)
+        entry = pit * self._seed_range + seeds
+        after = pits + self._gains.take(entry, axis=0)
+        flat = after.reshape(-1)
+        flat[base + pit] = 0
+        last = self._last.take(entry)
+
+        # Walk back from the last pit while it is on the opponent's side and holds 2 or 3 seeds,
+        # following only the rows that are still capturing
+        low = pps * (1 - player.astype(np.int64))
+        captured = np.zeros(len(pits), dtype=np.int64)
+        active = np.nonzero((last >= low) & (last < low + pps) & (seeds > 0))[0]
+        idx = last[active]
+        for _ in range(pps):
+            pos = base[active] + idx
+            count = flat.take(pos)
+            keep = (count == 2) | (count == 3)
+            active, idx, pos, count = active[keep], idx[keep], pos[keep], count[keep]
+            if not len(active):
+                break
+            captured[active] += count
+            flat[pos] = 0
+            idx = idx - 1
+            still = idx >= low[active]
+            active, idx = active[still], idx[still]
+
+        side_totals = after.reshape(len(pits), 2, pps).sum(axis=2, dtype=np.uint8)
+        opp_total = side_totals[np.arange(len(pits)), 1 - player.astype(np.int64)]
+        return after, captured, opp_total
+
+    def legal_mask(self) -> "np.ndarray":
+        """
+        Find the legal moves of the player to move on every board.
+
+        Grand Slam rule as in rules.generate_moves: a move that leaves the
+        opponent without seeds is illegal unless every move does.
+
+        Returns:
+            np.ndarray: (N, total_pits) bool, True at the legal pit indices.
+        """
+        n = len(self)
+        pps = self.pits_per_side
+        own = self.player.astype(np.int64)[:, None] * pps + np.arange(pps)[None, :]
+        _, _, opp_total = self._simulate(np.repeat(self.pits, pps, axis=0), np.repeat(self.player, pps),
+                                         own.reshape(-1))
+        nonempty = np.take_along_axis(self.pits, own, axis=1) > 0
+        feeds = nonempty & (opp_total > 0).reshape(n, pps)
+        legal = np.where(feeds.any(axis=1)[:, None], feeds, nonempty)
+
+        mask = np.zeros((n, self.total_pits), dtype=bool)
+        np.put_along_axis(mask, own, legal, axis=1)
+        return mask
+
+    def play(self, moves: "np.ndarray", check: bool = True) -> "np.ndarray":
+        """
+        Play one move on every board and pass the turn.
+
+        Args:
+            moves (np.ndarray): (N,) pit index per board; -1 leaves that board untouched.
+            check (bool, optional): Validate the moves against legal_mask. Defaults to True.
+
+        Returns:
+            np.ndarray: (N,) bool, True where a move was played (illegal moves are skipped like
+            rules.apply_move returning False).
+        """
+        moves = np.asarray(moves, dtype=np.int64)
+        ok = moves >= 0
+        if check:
+            mask = self.legal_mask()
+            ok &= mask[np.arange(len(self)), np.where(ok, moves, 0)]
+        if not ok.any():
+            return ok
+        rows = np.nonzero(ok)[0]
+        player = self.player[rows]
+        after, captured, _ = self._simulate(self.pits[rows], player, moves[rows])
+        self.pits[rows] = after
+        self.scores[rows, player] += captured.astype(np.uint8)
+        self.player[rows] = 1 - player
+        return ok
+
+    def finished(self) -> "np.ndarray":
+        """
+        Find the boards where one side is empty (game over, see game.collect_remaining).
+
+        Returns:
+            np.ndarray: (N,) bool.
+        """
+        pps = self.pits_per_side
+        return ~self.pits[:, :pps].any(axis=1) | ~self.pits[:, pps:].any(axis=1)
+
+    def sweep(self, rows: Optional["np.ndarray"] = None) -> None:
+        """
+        Give each player the seeds left on their side, like game.collect_remaining.
+
+        Args:
+            rows (Optional[np.ndarray], optional): Boards to sweep (indices or bool mask).
+                Defaults to the finished boards.
+        """
+        if rows is None:
+            rows = self.finished()
+        pps = self.pits_per_side
+        pits = self.pits[rows]
+        scores = self.scores[rows]
+        scores[:, 0] += pits[:, :pps].sum(axis=1, dtype=np.uint8)
+        scores[:, 1] += pits[:, pps:].sum(axis=1, dtype=np.uint8)
+        self.scores[rows] = scores
+        self.pits[rows] = 0
+
+    def random_moves(self, rng: "np.random.Generator") -> "np.ndarray":
+        """
+        Pick a uniformly random legal move on every board.
+
+        Args:
+            rng (np.random.Generator): Random source.
+
+        Returns:
+            np.ndarray: (N,) pit index, or -1 where there is no legal move.
+        """
+        mask = self.legal_mask()
+        keys = np.where(mask, rng.random(mask.shape), -1.0)
+        moves = keys.argmax(axis=1)
+        return np.where(mask.any(axis=1), moves, -1)
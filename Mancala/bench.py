@@ -0,0 +1,360 @@
+"""
+bench.py
+
+This contains benchmarks for the rules engine and the CPU search.
+Run it from the Mancala folder, for example:
+
+    python bench.py ordering --depth 7
+    python bench.py perft --depth 5
+    python bench.py search --depth 8
+    python bench.py clone --iterations 100000
+    python bench.py batch --boards 10000
+    python bench.py suite
+
+Every benchmark prints its results as JSON, with node or call rates, so
+runs on different commits can be compared.
+"""
+
+import argparse
+import json
+import platform
+import time
+from typing import Dict, List, Tuple
+from board import Board
+from cpu import CPUPlayer, INF
+import rules
+import state as packed
+
+# Fixed midgame positions: (pits, scores, player to move)
+MIDGAME_POSITIONS: List[Tuple[List[int], List[int], int]] = [
+    ([16, 1, 0, 10, 0, 2, 1, 1, 0, 3, 1, 3], [0, 10], 1),
+    ([2, 0, 1, 5, 9, 8, 8, 1, 7, 1, 1, 3], [0, 2], 1),
+    ([1, 1, 1, 11, 2, 1, 2, 3, 0, 1, 3, 5], [2, 15], 0),
+    ([3, 0, 6, 2, 6, 4, 4, 2, 0, 7, 7, 0], [0, 7], 0),
+    ([1, 0, 3, 1, 2, 2, 10, 1, 12, 1, 1, 11], [0, 3], 1),
+    ([1, 1, 0, 4, 4, 5, 1, 1, 1, 6, 0, 2], [4, 18], 0),
+    ([1, 1, 9, 9, 0, 0, 1, 4, 11, 4, 0, 4], [0, 4], 1),
+    ([0, 11, 3, 9, 5, 0, 1, 0, 0, 1, 9, 3], [6, 0], 1),
+]
+
+
+def position_board(pits: List[int], scores: List[int]) -> Board:
+    """
+    Build a Board holding the given pits and scores.
+
+    Args:
+        pits (List[int]): Seed count of every pit.
+        scores (List[int]): Scores of Player 0 and Player 1.
+
+    Returns:
+        Board: The board.
+    """
+    board = Board(len(pits) // 2)
+    for i, count in enumerate(pits):
+        board.pits[i].stones = count
+    board.scores = list(scores)
+    board.rehash()
+    return board
+
+
+def ordering_benchmark(depth: int = 7) -> Dict:
+    """
+    Count search nodes with and without move ordering at equal depth.
+
+    Each position is searched by iterative deepening up to depth with a
+    fresh CPUPlayer, once with move_ordering off and once with it on.
+
+    Args:
+        depth (int, optional): Deepest iteration. Defaults to 7.
+
+    Returns:
+        Dict: Per position node counts and timings plus the total reduction.
+    """
+    rows = []
+    totals = {False: 0, True: 0}
+    for pits, scores, player in MIDGAME_POSITIONS:
+        board = position_board(pits, scores)
+        row = {"pits": pits, "scores": scores, "player": player}
+        for ordering in (False, True):
+            cpu = CPUPlayer(player_id=player, difficulty="Hard", time_budget_ms=None)
+            cpu.max_depth = depth
+            cpu.move_ordering = ordering
+            cpu.pits_per_side = board.pits_per_side
+            start = time.perf_counter()
+            move = cpu._iterative_deepening(packed.pack(board))
+            elapsed = time.perf_counter() - start
+            label = "ordered" if ordering else "unordered"
+            row[label] = {"nodes": cpu._nodes, "seconds": round(elapsed, 4), "move": move}
+            totals[ordering] += cpu._nodes
+        rows.append(row)
+    return {
+        "benchmark": "move_ordering",
+        "depth": depth,
+        "positions": rows,
+        "total_nodes_unordered": totals[False],
+        "total_nodes_ordered": totals[True],
+        "node_reduction": round(1 - totals[True] / totals[False], 4) if totals[False] else 0.0,
+    }
+
+
+def perft(board: Board, player: int, depth: int) -> int:
+    """
+    Count the move sequences of a given length (leaf nodes of the full game tree).
+
+    Finished games (a side is empty) and positions without a legal move add nothing.
+
+    Args:
+        board (Board): The position; it is not modified.
+        player (int): Player to move.
+        depth (int): Number of plies.
+
+    Returns:
+        int: Number of leaf nodes at depth.
+    """
+    if depth == 0:
+        return 1
+    if board.is_empty_side(0) or board.is_empty_side(1):
+        return 0
+    nodes = 0
+    for pit in rules.legal_moves(board, player):
+        child = board.clone()
+        rules.apply_move(child, player, pit)
+        nodes += perft(child, 1 - player, depth - 1)
+    return nodes
+
+
+def perft_inplace(board: Board, player: int, depth: int) -> int:
+    """
+    Same count as perft, walking the tree on one board with rules.make_move/unmake_move.
+
+    Args:
+        board (Board): The position; it is restored before returning.
+        player (int): Player to move.
+        depth (int): Number of plies.
+
+    Returns:
+        int: Number of leaf nodes at depth.
+    """
+    if depth == 0:
+        return 1
+    if board.is_empty_side(0) or board.is_empty_side(1):
+        return 0
+    nodes = 0
+    for pit in rules.legal_moves(board, player):
+        undo = rules.make_move(board, player, pit)
+        nodes += perft_inplace(board, 1 - player, depth - 1)
+        rules.unmake_move(board, undo)
+    return nodes
+
+
+def _start_positions() -> List[Tuple[Board, int, str]]:
+    """Return the initial board and the midgame positions as (board, player, label)."""
+    positions = [(Board(), 0, "initial")]
+    for i, (pits, scores, player) in enumerate(MIDGAME_POSITIONS):
+        positions.append((position_board(pits, scores), player, f"midgame_{i}"))
+    return positions
+
+
+def perft_benchmark(depth: int = 5) -> Dict:
+    """
+    Run perft from the initial board and every midgame position.
+
+    Each position is counted twice: with Board.clone per child (perft) and
+    in place with make/unmake (perft_inplace); both counts must agree.
+
+    Args:
+        depth (int, optional): Number of plies. Defaults to 5.
+
+    Returns:
+        Dict: Leaf counts, timings and nodes per second per position and in total.
+    """
+    rows = []
+    total_nodes = 0
+    total_seconds = 0.0
+    total_inplace = 0.0
+    for board, player, label in _start_positions():
+        start = time.perf_counter()
+        nodes = perft(board, player, depth)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        inplace_nodes = perft_inplace(board, player, depth)
+        inplace = time.perf_counter() - start
+        if inplace_nodes != nodes:
+            raise RuntimeError(f"perft mismatch on {label}: {nodes} with clone, {inplace_nodes} in place")
+        rows.append({"position": label, "nodes": nodes, "seconds": round(elapsed, 4),
+                     "nodes_per_second": round(nodes / elapsed) if elapsed else None,
+                     "inplace_seconds": round(inplace, 4),
+                     "inplace_nodes_per_second": round(nodes / inplace) if inplace else None})
+        total_nodes += nodes
+        total_seconds += elapsed
+        total_inplace += inplace
+    return {
+        "benchmark": "perft",
+        "depth": depth,
+        "positions": rows,
+        "total_nodes": total_nodes,
+        "seconds": round(total_seconds, 4),
+        "nodes_per_second": round(total_nodes / total_seconds) if total_seconds else None,
+        "inplace_seconds": round(total_inplace, 4),
+        "inplace_nodes_per_second": round(total_nodes / total_inplace) if total_inplace else None,
+    }
+
+
+def search_benchmark(depth: int = 8) -> Dict:
+    """
+    Time a single fixed depth CPUPlayer._minimax call on every position.
+
+    Each call uses a fresh CPUPlayer (empty transposition table).
+
+    Args:
+        depth (int, optional): Search depth. Defaults to 8.
+
+    Returns:
+        Dict: Score, move, nodes, timings and nodes per second per position and in total.
+    """
+    rows = []
+    total_nodes = 0
+    total_seconds = 0.0
+    for board, player, label in _start_positions():
+        cpu = CPUPlayer(player_id=player, difficulty="Hard", time_budget_ms=None)
+        cpu.pits_per_side = board.pits_per_side
+        start = time.perf_counter()
+        score, move = cpu._minimax(packed.pack(board), depth, -INF, INF, True)
+        elapsed = time.perf_counter() - start
+        rows.append({"position": label, "score": score, "move": move, "nodes": cpu._nodes,
+                     "seconds": round(elapsed, 4),
+                     "nodes_per_second": round(cpu._nodes / elapsed) if elapsed else None})
+        total_nodes += cpu._nodes
+        total_seconds += elapsed
+    return {
+        "benchmark": "search",
+        "depth": depth,
+        "tablebase": cpu.tablebase is not None,
+        "positions": rows,
+        "total_nodes": total_nodes,
+        "seconds": round(total_seconds, 4),
+        "nodes_per_second": round(total_nodes / total_seconds) if total_seconds else None,
+    }
+
+
+def clone_benchmark(iterations: int = 100000) -> Dict:
+    """
+    Time Board.clone on the initial board and on a midgame board.
+
+    Args:
+        iterations (int, optional): Clones per board. Defaults to 100000.
+
+    Returns:
+        Dict: Timings, clones per second and nanoseconds per clone.
+    """
+    rows = []
+    boards = [(Board(), "initial"), (position_board(*MIDGAME_POSITIONS[0][:2]), "midgame_0")]
+    for board, label in boards:
+        clone = board.clone
+        start = time.perf_counter()
+        for _ in range(iterations):
+            clone()
+        elapsed = time.perf_counter() - start
+        rows.append({"position": label, "iterations": iterations, "seconds": round(elapsed, 4),
+                     "clones_per_second": round(iterations / elapsed) if elapsed else None,
+                     "ns_per_clone": round(elapsed * 1e9 / iterations, 1)})
+    return {"benchmark": "clone", "positions": rows}
+
+
+def batch_benchmark(boards: int = 10000, plies: int = 40, seed: int = 0) -> Dict:
+    """
+    Compare random playouts on BatchBoards (NumPy) with a loop over Board objects.
+
+    Both sides play the same number of plies from the initial position with
+    random legal moves; positions per second count the moves played.
+
+    Args:
+        boards (int, optional): Boards in the batch. Defaults to 10000.
+        plies (int, optional): Plies per board. Defaults to 40.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        Dict: Moves played, timings and positions per second for both engines.
+    """
+    import random
+    import numpy as np
+    from batch_rules import BatchBoards
+
+    rng = np.random.default_rng(seed)
+    batch = BatchBoards(boards)
+    played = 0
+    start = time.perf_counter()
+    for _ in range(plies):
+        moves = batch.random_moves(rng)
+        moves[batch.finished()] = -1
+        played += int(batch.play(moves, check=False).sum())
+    batch_seconds = time.perf_counter() - start
+
+    random.seed(seed)
+    loop_boards = max(1, boards // 100)
+    loop_played = 0
+    start = time.perf_counter()
+    for _ in range(loop_boards):
+        board = Board()
+        player = 0
+        for _ in range(plies):
+            legal = rules.legal_moves(board, player)
+            if not legal or board.is_empty_side(0) or board.is_empty_side(1):
+                break
+            rules.apply_move(board, player, random.choice(legal))
+            player = 1 - player
+            loop_played += 1
+    loop_seconds = time.perf_counter() - start
+
+    batch_rate = played / batch_seconds if batch_seconds else 0.0
+    loop_rate = loop_played / loop_seconds if loop_seconds else 0.0
+    return {
+        "benchmark": "batch",
+        "plies": plies,
+        "batch": {"boards": boards, "moves": played, "seconds": round(batch_seconds, 4),
+                  "positions_per_second": round(batch_rate)},
+        "board_loop": {"boards": loop_boards, "moves": loop_played, "seconds": round(loop_seconds, 4),
+                       "positions_per_second": round(loop_rate)},
+        "speedup": round(batch_rate / loop_rate, 1) if loop_rate else None,
+    }
+
+
+def main() -> None:
+    """Parse the command line and run the selected benchmark."""
+    parser = argparse.ArgumentParser(description="Oware engine benchmarks (JSON output).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ordering = sub.add_parser("ordering", help="node counts with and without move ordering")
+    ordering.add_argument("--depth", type=int, default=7)
+    perft_cmd = sub.add_parser("perft", help="leaf counts of the full game tree via rules.py")
+    perft_cmd.add_argument("--depth", type=int, default=5)
+    search = sub.add_parser("search", help="fixed depth CPUPlayer._minimax timings")
+    search.add_argument("--depth", type=int, default=8)
+    clone = sub.add_parser("clone", help="Board.clone microbenchmark")
+    clone.add_argument("--iterations", type=int, default=100000)
+    batch = sub.add_parser("batch", help="NumPy batched playouts against a Board loop")
+    batch.add_argument("--boards", type=int, default=10000)
+    batch.add_argument("--plies", type=int, default=40)
+    suite = sub.add_parser("suite", help="perft, search and clone with their default settings")
+    args = parser.parse_args()
+
+    if args.command == "ordering":
+        result = ordering_benchmark(args.depth)
+    elif args.command == "perft":
+        result = perft_benchmark(args.depth)
+    elif args.command == "search":
+        result = search_benchmark(args.depth)
+    elif args.command == "clone":
+        result = clone_benchmark(args.iterations)
+    elif args.command == "batch":
+        result = batch_benchmark(args.boards, args.plies)
+    else:
+        result = {
+            "benchmark": "suite",
+            "python": platform.python_version(),
+            "results": [perft_benchmark(), search_benchmark(), clone_benchmark()],
+        }
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
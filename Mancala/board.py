@@ -6,7 +6,112 @@ It includes the Pit class made for individual pits and the
 Board class with its game state and helper functions.
 """
 
+from functools import lru_cache
 from typing import List, Tuple
+from zobrist import zobrist_keys
+
+# Largest seed count kept in the precomputed sowing tables; bigger pits fall back to sow_delta.
+TABLE_MAX_SEEDS = 255
+
+
+def sow_plan(pit_index: int, seeds: int, total_pits: int) -> Tuple[int, int, int]:
+    """
+    Work out where a sowing of seeds ends without dropping them one by one.
+
+    Seeds go counter clockwise and the origin pit is skipped, so one full lap
+    feeds total_pits - 1 pits (standard Oware rule for 12 or more seeds).
+
+    Args:
+        pit_index (int): The pit being emptied.
+        seeds (int): Number of seeds taken from it (must be > 0).
+        total_pits (int): Number of pits on the board.
+
+    Returns:
+        Tuple[int, int, int]: (full laps, seeds left after the laps, index of the last pit sown into).
+    """
+    laps, remainder = divmod(seeds, total_pits - 1)
+    steps = remainder if remainder else total_pits - 1
+    return laps, remainder, (pit_index + steps) % total_pits
+
+
+def sow_delta(pit_index: int, seeds: int, total_pits: int) -> Tuple[Tuple[int, ...], int]:
+    """
+    Compute how many seeds every pit gains when a pit holding seeds is sown.
+
+    Args:
+        pit_index (int): The pit being emptied.
+        seeds (int): Number of seeds in it.
+        total_pits (int): Number of pits on the board.
+
+    Returns:
+        Tuple[Tuple[int, ...], int]: (Seeds added per pit, origin excluded, index of the last pit sown into).
+    """
+    if seeds == 0:
+        return (0,) * total_pits, pit_index
+    laps, remainder, last_idx = sow_plan(pit_index, seeds, total_pits)
+    delta = [laps] * total_pits
+    delta[pit_index] = 0
+    for step in range(1, remainder + 1):
+        delta[(pit_index + step) % total_pits] += 1
+    return tuple(delta), last_idx
+
+
+class SowTable:
+    """
+    Precomputed sowing results for one board geometry.
+
+    Attributes:
+        total_pits (int): Number of pits on the board.
+        max_seeds (int): Largest seed count held in the table.
+        deltas (List[List[Tuple[int, ...]]]): deltas[pit][seeds] is the per pit gain vector.
+        last (List[List[int]]): last[pit][seeds] is the index of the last pit sown into.
+    """
+
+    def __init__(self, total_pits: int, max_seeds: int = TABLE_MAX_SEEDS):
+        """
+        Build the tables.
+
+        Args:
+            total_pits (int): Number of pits on the board.
+            max_seeds (int, optional): Largest seed count to precompute. Defaults to TABLE_MAX_SEEDS.
+        """
+        self.total_pits = total_pits
+        self.max_seeds = max_seeds
+        self.deltas: List[List[Tuple[int, ...]]] = []
+        self.last: List[List[int]] = []
+        for pit in range(total_pits):
+            entries = [sow_delta(pit, seeds, total_pits) for seeds in range(max_seeds + 1)]
+            self.deltas.append([delta for delta, _ in entries])
+            self.last.append([last for _, last in entries])
+
+    def lookup(self, pit_index: int, seeds: int) -> Tuple[Tuple[int, ...], int]:
+        """
+        Return the gain vector and last pit for a sowing.
+
+        Args:
+            pit_index (int): The pit being emptied.
+            seeds (int): Number of seeds in it.
+
+        Returns:
+            Tuple[Tuple[int, ...], int]: Same as sow_delta.
+        """
+        if seeds <= self.max_seeds:
+            return self.deltas[pit_index][seeds], self.last[pit_index][seeds]
+        return sow_delta(pit_index, seeds, self.total_pits)
+
+
+@lru_cache(maxsize=None)
+def sow_table(total_pits: int) -> SowTable:
+    """
+    Return the shared SowTable for a board geometry, building it on first use.
+
+    Args:
+        total_pits (int): Number of pits on the board.
+
+    Returns:
+        SowTable: The cached table.
+    """
+    return SowTable(total_pits)
 
 
 class Pit:
@@ -63,6 +168,10 @@ class Board:
         total_pits (int): Total number of pits on the board.
         pits (List[Pit]): The list of Pit objects representing the board.
         scores (List[int]): A two element list tracking scores for Player 0 and Player 1.
+        sow_table (SowTable): Shared precomputed sowing results for this geometry.
+        hash_key (int): Zobrist hash of pits and scores, kept up to date by the mutators below.
+
+    Code that writes pits[i].stones or scores directly must call rehash() afterwards.
     """
 
     def __init__(self, pits_per_side: int = 6, initial_stones: int = 4):
@@ -78,6 +187,58 @@ class Board:
         self.total_pits = pits_per_side * 2
         self.pits: List[Pit] = [Pit(initial_stones) for i in range(self.total_pits)]
         self.scores = [0, 0]  
+        self.sow_table = sow_table(self.total_pits)
+        self.zobrist = zobrist_keys(self.total_pits)
+        self.hash_key = 0
+        self.rehash()
+
+    def rehash(self) -> int:
+        """
+        Recompute hash_key from scratch.
+
+        Returns:
+            int: The new hash key.
+        """
+        self.hash_key = self.zobrist.full_key([p.stones for p in self.pits], self.scores)
+        return self.hash_key
+
+    def position_key(self, player: int) -> int:
+        """
+        Return the hash of the position with a given side to move.
+
+        Args:
+            player (int): The player to move (0 or 1).
+
+        Returns:
+            int: hash_key, with the side key mixed in for Player 1.
+        """
+        return self.hash_key ^ self.zobrist.side if player else self.hash_key
+
+    def set_stones(self, pit_index: int, count: int) -> None:
+        """
+        Set the seed count of one pit and update the hash.
+
+        Args:
+            pit_index (int): The index of the pit.
+            count (int): The new number of seeds.
+        """
+        pit = self.pits[pit_index]
+        if pit.stones != count:
+            self.hash_key ^= self.zobrist.pit(pit_index, pit.stones) ^ self.zobrist.pit(pit_index, count)
+            pit.stones = count
+
+    def add_score(self, player: int, points: int) -> None:
+        """
+        Add points to a player's score and update the hash.
+
+        Args:
+            player (int): The player ID (0 or 1).
+            points (int): Points to add.
+        """
+        if points:
+            old = self.scores[player]
+            self.scores[player] = old + points
+            self.hash_key ^= self.zobrist.score(player, old) ^ self.zobrist.score(player, old + points)
 
     def clone(self) -> 'Board':
         """
@@ -86,9 +247,16 @@ class Board:
         Returns:
             Board: A new Board instance with identical state.
         """
-        b = Board(self.pits_per_side, self.initial_stones)
+        # Fill the fields directly: __init__ would build pits and a hash only to replace them
+        b = Board.__new__(Board)
+        b.pits_per_side = self.pits_per_side
+        b.initial_stones = self.initial_stones
+        b.total_pits = self.total_pits
         b.pits = [Pit(p.stones) for p in self.pits]
         b.scores = list(self.scores)
+        b.sow_table = self.sow_table
+        b.zobrist = self.zobrist
+        b.hash_key = self.hash_key
         return b
 
     def pit_owner(self, pit_index: int) -> int:
@@ -148,7 +316,8 @@ class Board:
         Execute the sowing action from a specific pit.
 
         Removes all seeds from the target pit and distributes them
-        counter clockwise +1 seed per pit.
+        counter clockwise +1 seed per pit, skipping the emptied pit on
+        every lap. The gains come from the precomputed sowing table.
 
         Args:
             pit_index (int): The index of the pit to sow from.
@@ -156,15 +325,15 @@ class Board:
         Returns:
             Tuple[int, int]: (index of the last pit sown into, stones in that pit).
         """
-        seeds = self.pits[pit_index].take_all()
+        seeds = self.pits[pit_index].stones
         if seeds == 0:
             return pit_index, 0
-        idx = pit_index
-        while seeds > 0:
-            idx = (idx + 1) % self.total_pits
-            self.pits[idx].add(1)
-            seeds -= 1
-        return idx, self.pits[idx].stones
+        self.set_stones(pit_index, 0)
+        delta, last_idx = self.sow_table.lookup(pit_index, seeds)
+        for i, gain in enumerate(delta):
+            if gain:
+                self.set_stones(i, self.pits[i].stones + gain)
+        return last_idx, self.pits[last_idx].stones
 
     def __str__(self) -> str:
         """Return a terminal friendly representation of the board."""
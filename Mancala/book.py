@@ -0,0 +1,181 @@
+"""
+book.py
+
+This builds and reads the opening book used by the Hard CPU.
+The book is built offline by searching every position reachable from the
+initial Board() in the first few plies (all moves of both players) to a
+fixed depth. The best move of each position is stored under its Zobrist
+key, so get_move can answer opening positions without searching.
+
+File layout: a header, then fixed width records (key, move, score) sorted
+by key, looked up with a binary search.
+
+Build from the Mancala folder, for example:
+
+    python book.py build --plies 4 --depth 10 --out opening.book
+"""
+
+import argparse
+import os
+import struct
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+from board import Board
+import state as packed
+from zobrist import SIDE_KEY
+from evaluation import SEED_VALUE
+
+MAGIC = b"OWBK"
+VERSION = 1
+HEADER = struct.Struct("<4sBBxxI")
+RECORD = struct.Struct("<QBb")
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening.book")
+
+
+def build_book(plies: int = 4, depth: int = 10, pits_per_side: int = 6, initial_stones: int = 4,
+               progress: Optional[Callable[[str], None]] = None) -> Dict[int, Tuple[int, int]]:
+    """
+    Search every position of the first plies and record the best move.
+
+    Args:
+        plies (int, optional): Number of plies from the start to cover. Defaults to 4.
+        depth (int, optional): Search depth per position. Defaults to 10.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+        initial_stones (int, optional): Starting stones per pit. Defaults to 4.
+        progress (Optional[Callable[[str], None]], optional): Receives one line per finished ply.
+
+    Returns:
+        Dict[int, Tuple[int, int]]: (best move, score for the player to move) per position key.
+    """
+    from cpu import CPUPlayer
+
+    start = packed.pack(Board(pits_per_side, initial_stones))
+    frontier = {(start, 0)}
+    book: Dict[int, Tuple[int, int]] = {}
+    searchers = [CPUPlayer(player_id=p, difficulty="Hard", time_budget_ms=None) for p in (0, 1)]
+    for cpu in searchers:
+        cpu.max_depth = depth
+        cpu.pits_per_side = pits_per_side
+
+    for ply in range(plies):
+        started = time.perf_counter()
+        next_frontier = set()
+        for state, player in sorted(frontier):
+            key = packed.hash_key(state, pits_per_side) ^ (SIDE_KEY if player else 0)
+            children = packed.children(state, player, pits_per_side)
+            if not children or key in book:
+                continue
+            cpu = searchers[player]
+            move = cpu._iterative_deepening(state)
+            if move is not None:
+                book[key] = (move, round(cpu.last_score / SEED_VALUE))
+            for _, child, _ in children:
+                next_frontier.add((child, 1 - player))
+        frontier = next_frontier
+        if progress is not None:
+            progress(f"ply {ply}: {len(book)} positions, {time.perf_counter() - started:.1f}s")
+    return book
+
+
+def write_book(path: str, book: Dict[int, Tuple[int, int]], pits_per_side: int = 6) -> None:
+    """
+    Write a book as sorted fixed width records.
+
+    Args:
+        path (str): Target file path.
+        book (Dict[int, Tuple[int, int]]): Output of build_book.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+    """
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, pits_per_side, len(book)))
+        for key in sorted(book):
+            move, score = book[key]
+            f.write(RECORD.pack(key, move, max(-128, min(127, score))))
+
+
+class OpeningBook:
+    """
+    An opening book read into one bytes object.
+
+    Attributes:
+        path (str): File the book was read from.
+        pits_per_side (int): Pits per player of the variant.
+        count (int): Number of positions in the book.
+    """
+
+    def __init__(self, path: str):
+        """
+        Read a book written by write_book.
+
+        Args:
+            path (str): Path of the .book file.
+
+        Raises:
+            ValueError: If the file is not a book of this version.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, pits_per_side, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or len(data) != HEADER.size + count * RECORD.size:
+            raise ValueError(f"{path} is not a version {VERSION} Oware opening book.")
+        self.pits_per_side = pits_per_side
+        self.count = count
+        self._data = data
+
+    def lookup(self, key: int) -> Optional[Tuple[int, int]]:
+        """
+        Find the stored move of a position.
+
+        Args:
+            key (int): Zobrist key with the side to move mixed in (Board.position_key).
+
+        Returns:
+            Optional[Tuple[int, int]]: (Move, score for the player to move), or None if not in the book.
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key, move, score = RECORD.unpack_from(self._data, HEADER.size + mid * RECORD.size)
+            if mid_key == key:
+                return move, score
+            if mid_key < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+
+@lru_cache(maxsize=None)
+def load_book(path: str) -> OpeningBook:
+    """
+    Read a book once per process and share it.
+
+    Args:
+        path (str): Path of the .book file.
+
+    Returns:
+        OpeningBook: The loaded book.
+    """
+    return OpeningBook(path)
+
+
+def main() -> None:
+    """Parse the command line and build a book."""
+    parser = argparse.ArgumentParser(description="Oware opening book tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="search the first plies and write a .book file")
+    build.add_argument("--plies", type=int, default=4)
+    build.add_argument("--depth", type=int, default=10)
+    build.add_argument("--out", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        book = build_book(args.plies, args.depth, progress=print)
+        write_book(args.out, book)
+        print(f"wrote {len(book)} positions to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
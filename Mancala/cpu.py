@@ -2,14 +2,46 @@
 cpu.py
 
 This implements the AI opponent for the Oware game.
-It includes the CPUPlayer class which uses Minimax (with Alpha-Beta pruning)
-to determine the best moves.
+It includes the CPUPlayer class which uses a negamax search with
+principal variation search (alpha-beta with null windows) and aspiration
+windows to determine the best moves. Search values are in evaluation
+units (evaluation.SEED_VALUE per seed).
 """
 
+import multiprocessing
+import os
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
 from typing import List, Optional, Tuple
 from board import Board
-from rules import legal_moves, apply_move
+from rules import legal_moves, generate_moves
+import state as packed
+from ttable import TranspositionTable, EXACT, LOWER, UPPER
+from zobrist import SIDE_KEY
+from tablebase import DEFAULT_PATH as DEFAULT_TABLEBASE, Tablebase, load_tablebase
+from book import DEFAULT_PATH as DEFAULT_BOOK, OpeningBook, load_book
+from search_stats import SearchStats
+from evaluation import DEFAULT_PATH as DEFAULT_EVAL, SEED_VALUE, Evaluator, load_evaluator
+
+# Deepest iteration the Hard search may reach when time allows
+MAX_SEARCH_DEPTH = 32
+# Nodes searched between two clock reads
+TIME_CHECK_INTERVAL = 256
+# Half width of the root aspiration window, in evaluation units
+ASPIRATION_WINDOW = 2 * SEED_VALUE
+# Bound larger than any reachable score difference
+INF = 1 << 20
+# Transposition table size of each root-parallel worker process, in megabytes
+WORKER_TT_MB = 16
+# Seconds between two stop_requested checks while waiting for the workers
+WORKER_POLL_INTERVAL = 0.05
+# Result of one root-parallel task: value, line, nodes, horizon reached, stats (see _search_root_child)
+ChildResult = Tuple[int, List[int], int, bool, Optional[SearchStats]]
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget of a move is used up."""
 
 
 class CPUPlayer:
@@ -19,20 +51,101 @@ class CPUPlayer:
     Attributes:
         player_id (int): The AI player index (1).
         difficulty (str): 'Easy', 'Medium', or 'Hard'.
-        max_depth (int): Depth limit for the Minimax algorithm.
+        max_depth (int): Depth limit for the Minimax algorithm (last iteration on Hard).
+        time_budget_ms (Optional[float]): Thinking time per Hard move; None searches every iteration up to max_depth.
+        completed_depth (int): Depth of the last fully searched iteration.
+        tt (TranspositionTable): Search results kept between get_move calls of one game.
+        move_ordering (bool): Try TT move, captures, killers and history moves first.
+        killers (List[List[Optional[int]]]): Two quiet moves per ply that last caused a cutoff.
+        history (List[List[int]]): Cutoff credit per [player][pit], kept across iterations.
+        principal_variation (List[int]): Expected line of play from the last Hard search.
+        last_score (Optional[int]): Root score of that search, from the AI's point of view (evaluation units).
+        workers (int): Processes used for Hard search; above 1 the root moves are split across a pool.
+        tablebase (Optional[Tablebase]): Endgame table probed by the search, if one is available.
+        book (Optional[OpeningBook]): Opening book consulted before searching, if one is available.
+        eval_path (Optional[str]): Weights file of the leaf evaluation; None uses the built in weights.
+        evaluator (Evaluator): Leaf evaluation of the search (see evaluation.py).
+        stop_requested (bool): Set from another thread to abort the running search; the thread
+            that owns the search clears it (see ponder.py and search_thread.py).
+        collect_stats (bool): Fill a SearchStats during every Hard get_move.
+        stats_log_path (Optional[str]): JSON lines file each SearchStats is appended to, if set.
+        last_stats (Optional[SearchStats]): Stats of the last Hard get_move when collect_stats is on.
+        stats (Optional[SearchStats]): Stats being filled by the running get_move, else None.
     """
 
-    def __init__(self, player_id: int = 1, difficulty: str = "Medium"):
+    def __init__(self, player_id: int = 1, difficulty: str = "Medium", tt_size_mb: float = 16,
+                 time_budget_ms: Optional[float] = 1000, workers: int = 1,
+                 tablebase_path: Optional[str] = None, book_path: Optional[str] = None,
+                 collect_stats: bool = False, stats_log_path: Optional[str] = None,
+                 eval_path: Optional[str] = None):
         """
         Initialize the CPU Player.
 
         Args:
             player_id (int, optional): ID of the AI player. Default is 1.
             difficulty (str, optional): 'Easy', 'Medium', or 'Hard'. Default is "Medium".
+            tt_size_mb (float, optional): Transposition table size in megabytes. Default is 16.
+            time_budget_ms (Optional[float], optional): Milliseconds per Hard move. Default is 1000.
+            workers (int, optional): Worker processes for Hard search. Default is 1 (no pool).
+            tablebase_path (Optional[str], optional): Endgame table file. Defaults to endgame.tb next to
+                this module, when that file exists.
+            book_path (Optional[str], optional): Opening book file. Defaults to opening.book next to
+                this module, when that file exists.
+            collect_stats (bool, optional): Record a SearchStats per Hard move. Default is False.
+            stats_log_path (Optional[str], optional): Append every SearchStats to this JSON lines file.
+            eval_path (Optional[str], optional): Evaluation weights file. Defaults to eval_weights.json next
+                to this module, when that file exists.
         """
         self.player_id = player_id
         self.difficulty = difficulty
-        self.max_depth = 4 if difficulty == "Hard" else 1
+        self.max_depth = MAX_SEARCH_DEPTH if difficulty == "Hard" else 1
+        self.time_budget_ms = time_budget_ms
+        self.completed_depth = 0
+        self.pits_per_side = 6
+        self.tt = TranspositionTable(tt_size_mb)
+        self.move_ordering = True
+        self.killers: List[List[Optional[int]]] = [[None, None] for _ in range(MAX_SEARCH_DEPTH + 1)]
+        self.history: List[List[int]] = [[0] * 12, [0] * 12]
+        self.principal_variation: List[int] = []
+        self.last_score: Optional[int] = None
+        self._pv: List[List[int]] = [[] for _ in range(MAX_SEARCH_DEPTH + 2)]
+        self._win_score = 24
+        self._total_seeds = 48
+        self._side_masks = (packed.side_mask(0), packed.side_mask(1))
+        self._deadline: Optional[float] = None
+        self._nodes = 0
+        self._hit_horizon = False
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._stop_event = None
+        if tablebase_path is None and os.path.exists(DEFAULT_TABLEBASE):
+            tablebase_path = DEFAULT_TABLEBASE
+        self.tablebase_path = tablebase_path
+        self.tablebase: Optional[Tablebase] = load_tablebase(tablebase_path) if tablebase_path else None
+        if book_path is None and os.path.exists(DEFAULT_BOOK):
+            book_path = DEFAULT_BOOK
+        self.book: Optional[OpeningBook] = load_book(book_path) if book_path else None
+        self.stop_requested = False
+        self.collect_stats = collect_stats or stats_log_path is not None
+        self.stats_log_path = stats_log_path
+        self.last_stats: Optional[SearchStats] = None
+        self.stats: Optional[SearchStats] = None
+        if eval_path is None and os.path.exists(DEFAULT_EVAL):
+            eval_path = DEFAULT_EVAL
+        self.eval_path = eval_path
+        self.evaluator: Evaluator = load_evaluator(eval_path)
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._stop_event.set()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def new_game(self) -> None:
+        """Forget everything learned during the previous game."""
+        self.tt.clear()
+        self.history = [[0] * 12, [0] * 12]
 
     def set_difficulty(self, difficulty: str) -> None:
         """
@@ -42,7 +155,7 @@ class CPUPlayer:
             difficulty (str): New difficulty level.
         """
         self.difficulty = difficulty
-        self.max_depth = 4 if difficulty == "Hard" else 1
+        self.max_depth = MAX_SEARCH_DEPTH if difficulty == "Hard" else 1
     
     def get_move(self, board: Board) -> int:
         """
@@ -69,15 +182,73 @@ class CPUPlayer:
                 return self._get_smart_move(board, legal)
 
         elif self.difficulty == "Hard":
-            # first move doesn't matter that much
-            if sum(p.stones for p in board.pits) == board.total_pits * 4:
-                 return random.choice(legal)
-            
-            _, move = self._minimax(board, self.max_depth, float('-inf'), float('inf'), True)
-            return move if move is not None else random.choice(legal)
+            if not self.collect_stats:
+                return self._get_hard_move(board, legal)
+            stats = SearchStats()
+            self.stats = stats
+            probes, hits = self.tt.hits + self.tt.misses, self.tt.hits
+            start = time.perf_counter()
+            try:
+                move = self._get_hard_move(board, legal)
+            finally:
+                self.stats = None
+            stats.elapsed_ms = (time.perf_counter() - start) * 1000.0
+            stats.move = move
+            if stats.source in ("search", "parallel"):
+                stats.score = self.last_score
+                stats.nodes = self._nodes
+                stats.depth = self.completed_depth
+                # Parallel searches already added the workers' table counters
+                stats.tt_probes += self.tt.hits + self.tt.misses - probes
+                stats.tt_hits += self.tt.hits - hits
+            self.last_stats = stats
+            if self.stats_log_path:
+                stats.log(self.stats_log_path)
+            return move
 
         return random.choice(legal)
     
+    def _get_hard_move(self, board: Board, legal: List[int]) -> int:
+        """
+        Pick a Hard move: opening book, then search.
+
+        Args:
+            board (Board): Current board.
+            legal (List[int]): List of legal move indices.
+
+        Returns:
+            int: The selected pit.
+        """
+        stats = self.stats
+        has_book = self.book is not None and self.book.pits_per_side == board.pits_per_side
+        if has_book:
+            entry = self.book.lookup(board.position_key(self.player_id))
+            if entry is not None and entry[0] in legal:
+                self.principal_variation = [entry[0]]
+                self.last_score = entry[1] * SEED_VALUE
+                if stats is not None:
+                    stats.source = "book"
+                return entry[0]
+
+        # without a book, the first move of the game doesn't matter that much
+        if (not has_book and not any(board.scores)
+                and all(p.stones == board.initial_stones for p in board.pits)):
+            # No score for this move (last_score would otherwise be left over from the previous one)
+            self.principal_variation = []
+            self.last_score = None
+            if stats is not None:
+                stats.source = "random"
+            return random.choice(legal)
+
+        self.pits_per_side = board.pits_per_side
+        if self.workers > 1:
+            if stats is not None:
+                stats.source = "parallel"
+            move = self._parallel_search(packed.pack(board))
+        else:
+            move = self._iterative_deepening(packed.pack(board))
+        return move if move in legal else random.choice(legal)
+
     def has_legal_moves(self, board: Board) -> bool:
         """
         Check if the AI has any legal moves available.
@@ -105,66 +276,499 @@ class CPUPlayer:
         best_move = legal[0]
         max_score = -1
         
-        for move in legal:
-            temp_board = board.clone()
-            apply_move(temp_board, self.player_id, move, simulate_only=True)
-            score_gain = temp_board.scores[self.player_id] - board.scores[self.player_id]
-            
-            if score_gain > max_score:
-                max_score = score_gain
-                best_move = move
+        for result in generate_moves(board, self.player_id):
+            if result.pit in legal and result.captured > max_score:
+                max_score = result.captured
+                best_move = result.pit
+        return best_move
+
+    def _iterative_deepening(self, state: int, use_budget: bool = True) -> Optional[int]:
+        """
+        Search depth 1, 2, 3... until the time budget or max_depth is reached.
+
+        An iteration cut short by the clock is thrown away, so the move always
+        comes from the last completed iteration. Depth 1 always completes.
+        From depth 2 on, the root is searched with an aspiration window
+        around the previous score and re-searched with an open bound on failure.
+
+        Args:
+            state (int): The packed root state (AI to move).
+            use_budget (bool, optional): Stop at time_budget_ms. When False only
+                max_depth or stop_requested end the search (pondering). Default is True.
+
+        Returns:
+            Optional[int]: Best move of the last completed iteration.
+        """
+        deadline = None
+        if use_budget and self.time_budget_ms is not None:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+        self._prepare_search(state)
+        key = packed.hash_key(state, self.pits_per_side)
+        best_move = None
+        score = None
+
+        for depth in range(1, self.max_depth + 1):
+            self._deadline = deadline if depth > 1 else None
+            self._hit_horizon = False
+            alpha, beta = -INF, INF
+            if score is not None:
+                alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+            try:
+                while True:
+                    value = self._negamax(state, depth, alpha, beta, self.player_id, key, 0)
+                    if value <= alpha:
+                        alpha = -INF
+                    elif value >= beta:
+                        beta = INF
+                    else:
+                        break
+            except SearchTimeout:
+                break
+            finally:
+                self._deadline = None
+            score = value
+            if self.stats is not None:
+                self.stats.iteration_nodes.append(self._nodes - sum(self.stats.iteration_nodes))
+            self.principal_variation = list(self._pv[0])
+            self.last_score = score
+            best_move = self.principal_variation[0] if self.principal_variation else None
+            self.completed_depth = depth
+            # Every line ended before the horizon: deeper iterations would repeat this one
+            if not self._hit_horizon:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
         return best_move
 
-    def _minimax(self, board: Board, depth: int, alpha: float, beta: float, maximizing: bool) -> Tuple[float, Optional[int]]:
+    def _parallel_search(self, state: int) -> Optional[int]:
+        """
+        Iterative deepening with the root moves split across worker processes.
+
+        Every worker process keeps one CPUPlayer and its transposition table
+        for as long as the pool lives (see _init_worker), so each round only
+        searches the children to the new depth and finds the table filled by
+        the rounds and moves before it. As in _iterative_deepening, rounds
+        from depth 2 on use an aspiration window around the previous score
+        and are repeated with an open bound on failure. Ties go to the
+        earlier move in root order.
+
+        Args:
+            state (int): The packed root state (AI to move).
+
+        Returns:
+            Optional[int]: Best move of the last completed iteration.
         """
-        Execute Minimax algorithm with Alpha-Beta pruning.
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = time.time() + self.time_budget_ms / 1000.0
+        self._prepare_search(state)
+        pps = self.pits_per_side
+        legal = packed.children(state, self.player_id, pps)
+        legal = self._order_moves(legal, None, 0, self.player_id)
+        if self._pool is None:
+            self._stop_event = multiprocessing.Event()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.tablebase_path, self.eval_path, self._stop_event))
+        self._stop_event.clear()
+        best_move = None
+        score = None
+
+        for depth in range(1, self.max_depth + 1):
+            child_deadline = deadline if depth > 1 else None
+            alpha, beta = -INF, INF
+            if score is not None:
+                alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+            round_nodes = 0
+            while True:
+                results = self._search_root_children(legal, depth - 1, alpha, beta, child_deadline)
+                if results is None:
+                    return best_move
+                round_nodes += sum(r[2] for r in results) + len(results)
+                if self.stats is not None:
+                    for r in results:
+                        self.stats.merge(r[4])
+                value = max(-r[0] for r in results)
+                if value <= alpha:
+                    alpha = -INF
+                elif value >= beta:
+                    beta = INF
+                else:
+                    break
+
+            best_value = -INF
+            hit_horizon = False
+            self._nodes += round_nodes
+            if self.stats is not None:
+                self.stats.iteration_nodes.append(round_nodes)
+            for (move, _, _), (value, pv, _, horizon, _) in zip(legal, results):
+                hit_horizon = hit_horizon or horizon
+                if -value > best_value:
+                    best_value = -value
+                    best_move = move
+                    self.principal_variation = [move] + pv
+            score = best_value
+            self.last_score = best_value
+            self.completed_depth = depth
+            if not hit_horizon or self.stop_requested:
+                break
+            if deadline is not None and time.time() >= deadline:
+                break
+        return best_move
+
+    def _search_root_children(self, legal: List[Tuple[int, int, int]], depth: int, alpha: int, beta: int,
+                              deadline: Optional[float]) -> Optional[List[ChildResult]]:
+        """
+        Search every root child on the worker pool with the root window (alpha, beta).
+
+        Args:
+            legal (List[Tuple[int, int, int]]): Root children from state.children, in root order.
+            depth (int): Remaining depth of the children.
+            alpha (int): Lower bound of the root window.
+            beta (int): Upper bound of the root window.
+            deadline (Optional[float]): Wall clock (time.time) limit, or None.
+
+        Returns:
+            Optional[List[ChildResult]]: The result of _search_root_child for every child in root order,
+            or None if the deadline passed or stop_requested was set first.
+        """
+        player = 1 - self.player_id
+        collect_stats = self.stats is not None
+        futures = [self._pool.submit(_search_root_child, child, player, depth, -beta, -alpha,
+                                     self.pits_per_side, deadline, collect_stats)
+                   for _, child, _ in legal]
+        pending = set(futures)
+        while pending and not self.stop_requested:
+            timeout = WORKER_POLL_INTERVAL
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.time())
+                if timeout <= 0:
+                    break
+            _, pending = wait(pending, timeout=timeout)
+        if self.stop_requested:
+            # Running tasks check the shared event and give up
+            self._stop_event.set()
+        for f in pending:
+            f.cancel()
+        if pending:
+            return None
+        results = [f.result() for f in futures]
+        if any(r is None for r in results):
+            return None
+        return results
+
+    def _prepare_search(self, state: int) -> None:
+        """
+        Reset per search counters and tables.
+
+        Args:
+            state (int): The packed root state.
+        """
+        pps = self.pits_per_side
+        seeds = sum(packed.stones(state, i) for i in range(2 * pps))
+        self._total_seeds = seeds + packed.score(state, 0, pps) + packed.score(state, 1, pps)
+        self._win_score = self._total_seeds // 2
+        self._side_masks = (packed.side_mask(0, pps), packed.side_mask(1, pps))
+        if self.evaluator.pits_per_side != pps:
+            self.evaluator = load_evaluator(self.eval_path, pps)
+        self.completed_depth = 0
+        self.principal_variation = []
+        self.last_score = None
+        self._nodes = 0
+        self._reset_ordering()
+
+    def _reset_ordering(self) -> None:
+        """Clear killer moves and age the history table before a new search."""
+        total_pits = 2 * self.pits_per_side
+        self.killers = [[None, None] for _ in range(MAX_SEARCH_DEPTH + 1)]
+        if len(self.history[0]) != total_pits:
+            self.history = [[0] * total_pits, [0] * total_pits]
+        else:
+            self.history = [[h // 2 for h in row] for row in self.history]
+
+    def _order_moves(self, legal: List[Tuple[int, int, int]], tt_move: Optional[int], ply: int,
+                     player: int) -> List[Tuple[int, int, int]]:
+        """
+        Sort children so the moves most likely to cause a cutoff come first.
+
+        Order: transposition table move, captures (largest first),
+        killer moves of this ply, then the rest by history score.
 
         Args:
-            board (Board): The board state to evaluate.
+            legal (List[Tuple[int, int, int]]): Children from state.children.
+            tt_move (Optional[int]): Best move stored for this position, if any.
+            ply (int): Distance from the root.
+            player (int): Player to move.
+
+        Returns:
+            List[Tuple[int, int, int]]: The same children, reordered.
+        """
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+        history = self.history[player]
+
+        def priority(child: Tuple[int, int, int]) -> int:
+            move, _, captured = child
+            if move == tt_move:
+                return 1 << 30
+            if captured:
+                return (1 << 28) + captured
+            if move == killers[0]:
+                return (1 << 27) + 1
+            if move == killers[1]:
+                return 1 << 27
+            return history[move]
+
+        return sorted(legal, key=priority, reverse=True)
+
+    def _record_cutoff(self, move: int, captured: int, depth: int, ply: int, player: int) -> None:
+        """
+        Credit a quiet move that caused a beta cutoff.
+
+        Args:
+            move (int): The move that cut off.
+            captured (int): Seeds it captured (captures are already ordered first).
+            depth (int): Remaining depth at the node.
+            ply (int): Distance from the root.
+            player (int): Player who made the move.
+        """
+        if captured:
+            return
+        if ply < len(self.killers) and self.killers[ply][0] != move:
+            self.killers[ply][1] = self.killers[ply][0]
+            self.killers[ply][0] = move
+        self.history[player][move] += depth * depth
+
+    def _minimax(self, state: int, depth: int, alpha: float, beta: float, maximizing: bool,
+                 key: Optional[int] = None, ply: int = 0) -> Tuple[float, Optional[int]]:
+        """
+        Run a fixed depth search and report it from the AI's point of view.
+
+        Thin wrapper around _negamax kept for callers that think in
+        maximizing/minimizing terms (benchmarks, analysis scripts).
+
+        Args:
+            state (int): The packed state to evaluate.
             depth (int): Remaining depth to search.
             alpha (float): Best value for maximizer so far.
             beta (float): Best value for minimizer so far.
             maximizing (bool): True if it's the AI's turn (maximize).
+            key (Optional[int], optional): Zobrist hash of state. Computed when omitted.
+            ply (int, optional): Distance from the root. Default is 0.
 
         Returns:
             Tuple[float,Optional[int]]: (Best Score, Best Move Index).
         """
-        current_player = self.player_id if maximizing else (1 - self.player_id)
-        legal = legal_moves(board, current_player)
+        alpha = int(max(alpha, -INF))
+        beta = int(min(beta, INF))
+        if ply == 0:
+            self._prepare_search(state)
+        if key is None:
+            key = packed.hash_key(state, self.pits_per_side)
+        if maximizing:
+            value = self._negamax(state, depth, alpha, beta, self.player_id, key, ply)
+        else:
+            value = -self._negamax(state, depth, -beta, -alpha, 1 - self.player_id, key, ply)
+        pv = self._pv[ply]
+        return value, (pv[0] if pv else None)
+
+    def _negamax(self, state: int, depth: int, alpha: int, beta: int, player: int, key: int, ply: int) -> int:
+        """
+        Negamax search with principal variation search and a transposition table.
+
+        Below the root, finished games are scored with the end of game sweep,
+        positions covered by the endgame table return its exact value and
+        decided positions return the score difference.
+
+        The first (best ordered) child is searched with the full window, the
+        others with a null window that is widened only if they beat alpha.
+        Works on packed states (see state.py) so no Board is cloned per node.
+        The line found is left in self._pv[ply].
+        Raises SearchTimeout once the deadline set by _iterative_deepening
+        passes or stop_requested is set from another thread.
+
+        Args:
+            state (int): The packed state to evaluate.
+            depth (int): Remaining depth to search.
+            alpha (int): Lower bound of the window.
+            beta (int): Upper bound of the window.
+            player (int): Player to move.
+            key (int): Zobrist hash of state (side to move not included).
+            ply (int): Distance from the root.
+
+        Returns:
+            int: Score difference from the point of view of the player to move.
+        """
+        self._nodes += 1
+        if self._nodes % TIME_CHECK_INTERVAL == 0:
+            if self.stop_requested or (self._deadline is not None and time.perf_counter() >= self._deadline):
+                raise SearchTimeout()
+
+        pv = self._pv
+        pv[ply] = []
+        pps = self.pits_per_side
+        own = packed.score(state, player, pps)
+        other = packed.score(state, 1 - player, pps)
+        stats = self.stats
+        if stats is not None and ply > stats.seldepth:
+            stats.seldepth = ply
+
+        if ply > 0:
+            if not state & self._side_masks[player] or not state & self._side_masks[1 - player]:
+                # Game over: each player sweeps their own side
+                if stats is not None:
+                    stats.leaf_evals += 1
+                return SEED_VALUE * (own - other + packed.side_total(state, player, pps)
+                                     - packed.side_total(state, 1 - player, pps))
+            tablebase = self.tablebase
+            if (tablebase is not None and tablebase.pits_per_side == pps
+                    and self._total_seeds - own - other <= tablebase.max_seeds):
+                value = tablebase.probe(state, player)
+                if value is not None:
+                    if stats is not None:
+                        stats.leaf_evals += 1
+                    return SEED_VALUE * (own - other + value)
 
         #end conditions
-        if depth == 0 or not legal or board.scores[0] > 24 or board.scores[1] > 24:
-            return (board.scores[self.player_id] - board.scores[1 - self.player_id]), None
+        if ply > 0 and (own > self._win_score or other > self._win_score):
+            # Decided: more than half the seeds are already captured (the root still looks for the best margin)
+            if stats is not None:
+                stats.leaf_evals += 1
+            return SEED_VALUE * (own - other)
+        if depth == 0 or ply > MAX_SEARCH_DEPTH:
+            self._hit_horizon = True
+            if stats is not None:
+                stats.leaf_evals += 1
+            return self.evaluator.evaluate(state, player)
 
+        tt_key = key ^ SIDE_KEY if player else key
+        entry = self.tt.probe(tt_key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, flag, value, tt_move = entry
+            # The root is always expanded so it yields a move and a full line
+            if entry_depth >= depth and ply > 0:
+                self._hit_horizon = True
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        legal = packed.children(state, player, pps)
+        if not legal:
+            return SEED_VALUE * (own - other)
+        if self.move_ordering and len(legal) > 1:
+            legal = self._order_moves(legal, tt_move, ply, player)
+
+        alpha_orig = alpha
+        opp = 1 - player
+        best = -INF
         best_move = None
-        
-        if maximizing:
-            max_eval = float('-inf')
-            for move in legal:
-                sim_board = board.clone()
-                apply_move(sim_board, current_player, move)
-                
-                eval_score, _ = self._minimax(sim_board, depth - 1, alpha, beta, False)
-                
-                if eval_score > max_eval:
-                    max_eval = eval_score
-                    best_move = move
-                
-                alpha = max(alpha, eval_score)
-                if beta <= alpha: break
-            return max_eval, best_move
+        for i, (move, child, captured) in enumerate(legal):
+            child_key = packed.update_key(key, state, child, pps)
+            if i == 0:
+                value = -self._negamax(child, depth - 1, -beta, -alpha, opp, child_key, ply + 1)
+            else:
+                value = -self._negamax(child, depth - 1, -alpha - 1, -alpha, opp, child_key, ply + 1)
+                if alpha < value < beta:
+                    value = -self._negamax(child, depth - 1, -beta, -alpha, opp, child_key, ply + 1)
+            if value > best:
+                best = value
+                best_move = move
+                if value > alpha:
+                    alpha = value
+                    pv[ply] = [move] + pv[ply + 1]
+                    if alpha >= beta:
+                        self._record_cutoff(move, captured, depth, ply, player)
+                        if stats is not None:
+                            stats.record_cutoff(i)
+                        break
+
+        if best <= alpha_orig:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
         else:
-            min_eval = float('inf')
-            for move in legal:
-                sim_board = board.clone()
-                apply_move(sim_board, current_player, move)
-                
-                eval_score, _ = self._minimax(sim_board, depth - 1, alpha, beta, True)
-                
-                if eval_score < min_eval:
-                    min_eval = eval_score
-                    best_move = move
-                
-                beta = min(beta, eval_score)
-                if beta <= alpha: break
-            return min_eval, best_move
\ No newline at end of file
+            flag = EXACT
+        self.tt.store(tt_key, depth, flag, best, best_move)
+        return best
+
+
+class _WorkerPlayer(CPUPlayer):
+    """The CPUPlayer of a root-parallel worker process; its stop flag is the pool's shared stop event."""
+
+    @property
+    def stop_requested(self) -> bool:
+        return _worker_stop is not None and _worker_stop.is_set()
+
+    @stop_requested.setter
+    def stop_requested(self, value: bool) -> None:
+        pass
+
+
+# Player and stop event of this worker process, set by _init_worker
+_worker: Optional[_WorkerPlayer] = None
+_worker_stop = None
+
+
+def _init_worker(tablebase_path: Optional[str], eval_path: Optional[str], stop_event) -> None:
+    """
+    Build the player that every task of this worker process searches with.
+
+    Args:
+        tablebase_path (Optional[str]): Endgame table to probe, as in CPUPlayer.
+        eval_path (Optional[str]): Evaluation weights file, as in CPUPlayer.
+        stop_event (multiprocessing.Event): Set by the parent to abort the running tasks.
+    """
+    global _worker, _worker_stop
+    _worker_stop = stop_event
+    _worker = _WorkerPlayer(player_id=0, difficulty="Hard", tt_size_mb=WORKER_TT_MB, time_budget_ms=None,
+                            tablebase_path=tablebase_path, book_path="", eval_path=eval_path)
+
+
+def _search_root_child(child: int, player: int, depth: int, alpha: int, beta: int, pits_per_side: int,
+                       deadline: Optional[float], collect_stats: bool = False) -> Optional[ChildResult]:
+    """
+    Search one root child in a worker process (root-parallel search).
+
+    The child is searched at ply 1 with the worker's own player, so it is
+    scored exactly as the serial search scores it and the worker's table
+    carries over from earlier tasks.
+
+    Args:
+        child (int): Packed state after the root move.
+        player (int): Player to move in the child.
+        depth (int): Remaining depth of the child.
+        alpha (int): Lower bound of the window, for the player to move in the child.
+        beta (int): Upper bound of the window.
+        pits_per_side (int): Pits per player.
+        deadline (Optional[float]): Wall clock (time.time) limit, or None.
+        collect_stats (bool, optional): Return the task's search counters. Default is False.
+
+    Returns:
+        Optional[ChildResult]: (Value for the player to move in the child, its principal variation,
+        nodes searched, whether the horizon was reached, the task's SearchStats when collect_stats
+        is set), or None when the deadline passed or the parent asked to stop.
+    """
+    cpu = _worker
+    if cpu.pits_per_side != pits_per_side:
+        cpu.new_game()
+    cpu.pits_per_side = pits_per_side
+    cpu._prepare_search(child)
+    cpu._hit_horizon = False
+    stats = SearchStats() if collect_stats else None
+    cpu.stats = stats
+    probes, hits = cpu.tt.hits + cpu.tt.misses, cpu.tt.hits
+    if deadline is not None:
+        cpu._deadline = time.perf_counter() + (deadline - time.time())
+    try:
+        value = cpu._negamax(child, depth, alpha, beta, player, packed.hash_key(child, pits_per_side), 1)
+    except SearchTimeout:
+        return None
+    finally:
+        cpu._deadline = None
+        cpu.stats = None
+    if stats is not None:
+        stats.tt_probes = cpu.tt.hits + cpu.tt.misses - probes
+        stats.tt_hits = cpu.tt.hits - hits
+    return value, list(cpu._pv[1]), cpu._nodes, cpu._hit_horizon, stats
@@ -0,0 +1,120 @@
+"""
+evaluation.py
+
+This contains the static evaluation used at the leaves of the CPU search.
+Besides the score difference it rewards or penalizes a few positional
+features, each counted for the player to move minus the opponent:
+
+- vulnerable: pits holding 1 or 2 seeds (a sown seed turns them into a capture)
+- mobility: non empty pits (number of moves available)
+- kroo: pits holding enough seeds to lap the board
+- seeds: seeds on the player's own side (kept by the end of game sweep)
+
+Every feature is a sum over pits of a function of the pit's seed count,
+so the weights are folded into one lookup table per Evaluator and a leaf
+costs twelve table lookups. Values are integers in units of 1/SEED_VALUE
+seed, as the transposition table requires.
+
+Weights are read from a JSON file such as eval_weights.json:
+
+    {"vulnerable": -0.25, "mobility": 0.1, "kroo": 0.5, "seeds": 0.05}
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Optional
+import state as packed
+
+# Evaluation units per captured seed
+SEED_VALUE = 100
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_weights.json")
+# Feature weights in seeds, used when no weights file exists
+DEFAULT_WEIGHTS: Dict[str, float] = {"vulnerable": -0.25, "mobility": 0.1, "kroo": 0.5, "seeds": 0.05}
+
+
+def load_weights(path: str) -> Dict[str, float]:
+    """
+    Read feature weights from a JSON file.
+
+    Args:
+        path (str): Path of the weights file.
+
+    Returns:
+        Dict[str, float]: DEFAULT_WEIGHTS updated with the file's values.
+
+    Raises:
+        ValueError: If the file names an unknown feature.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    unknown = set(data) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown evaluation features in {path}: {sorted(unknown)}")
+    weights = dict(DEFAULT_WEIGHTS)
+    weights.update({name: float(value) for name, value in data.items()})
+    return weights
+
+
+class Evaluator:
+    """
+    Scores packed states for the side to move.
+
+    Attributes:
+        weights (Dict[str, float]): Feature weights, in seeds.
+        pits_per_side (int): Pits per player the table was built for.
+        pit_values (List[int]): Value of one pit by seed count, in evaluation units.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, pits_per_side: int = 6):
+        """
+        Fold the weights into the per pit value table.
+
+        Args:
+            weights (Optional[Dict[str, float]], optional): Feature weights in seeds. Defaults to DEFAULT_WEIGHTS.
+            pits_per_side (int, optional): Pits per player. Defaults to 6.
+        """
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        self.pits_per_side = pits_per_side
+        total_pits = 2 * pits_per_side
+        w = self.weights
+        self.pit_values = [
+            round(SEED_VALUE * (w["vulnerable"] * (1 <= n <= 2) + w["mobility"] * (n > 0)
+                                + w["kroo"] * (n >= total_pits) + w["seeds"] * n))
+            for n in range(packed.FIELD_MASK + 1)
+        ]
+        self._width = total_pits + 2
+
+    def evaluate(self, state: int, player: int) -> int:
+        """
+        Score a packed state for the player to move.
+
+        Args:
+            state (int): The packed state.
+            player (int): Player to move.
+
+        Returns:
+            int: SEED_VALUE times the score difference, plus the weighted features.
+        """
+        pps = self.pits_per_side
+        fields = state.to_bytes(self._width, "little")
+        values = self.pit_values
+        side0 = sum(map(values.__getitem__, fields[:pps]))
+        side1 = sum(map(values.__getitem__, fields[pps:2 * pps]))
+        value = SEED_VALUE * (fields[2 * pps] - fields[2 * pps + 1]) + side0 - side1
+        return -value if player else value
+
+
+@lru_cache(maxsize=None)
+def load_evaluator(path: Optional[str] = None, pits_per_side: int = 6) -> Evaluator:
+    """
+    Build an Evaluator from a weights file once per process and share it.
+
+    Args:
+        path (Optional[str], optional): Weights file; None uses DEFAULT_WEIGHTS.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        Evaluator: The evaluator.
+    """
+    return Evaluator(load_weights(path) if path else None, pits_per_side)
@@ -9,32 +9,50 @@ from board import Board
 from rules import legal_moves, apply_move
 
 
-def game_end_sweep(board: Board, last_player: int) -> bool:
+def collect_remaining(board: Board, force: bool = False) -> bool:
     """
-    Handle the end of game part where remaining stones are collected.
+    Sweep the remaining stones into the scores if the game is over, without printing.
 
-    When the game ends, the player who still has stones/seeds captures them.
+    When one side is empty, each player captures the stones left on their own side.
 
     Args:
         board (Board): The game board.
-        last_player (int): The player who made the last move.
+        force (bool, optional): Sweep even if both sides still have stones
+            (move limit reached or no legal move). Defaults to False.
 
     Returns:
-        bool: Returns True to indicate the game has finished.
+        bool: True if the board was swept, i.e. the game has finished.
     """
     p0_total = sum(board.pits[i].stones for i in board.player_pit_indices(0))
     p1_total = sum(board.pits[i].stones for i in board.player_pit_indices(1))
-    
-    if p0_total == 0 or p1_total == 0:
+
+    if p0_total == 0 or p1_total == 0 or force:
         if p0_total > 0:
-            board.scores[0] += p0_total
+            board.add_score(0, p0_total)
             for i in board.player_pit_indices(0):
-                board.pits[i].stones = 0
+                board.set_stones(i, 0)
         if p1_total > 0:
-            board.scores[1] += p1_total
+            board.add_score(1, p1_total)
             for i in board.player_pit_indices(1):
-                board.pits[i].stones = 0
+                board.set_stones(i, 0)
+        return True
+    return False
+
+
+def game_end_sweep(board: Board, last_player: int) -> bool:
+    """
+    Handle the end of game part where remaining stones are collected.
+
+    When the game ends, the player who still has stones/seeds captures them.
 
+    Args:
+        board (Board): The game board.
+        last_player (int): The player who made the last move.
+
+    Returns:
+        bool: Returns True to indicate the game has finished.
+    """
+    if collect_remaining(board):
         print("\nFinal board:")
         print(board)
         if board.scores[0] > board.scores[1]:
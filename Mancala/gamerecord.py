@@ -0,0 +1,214 @@
+"""
+gamerecord.py
+
+This reads and writes game records in a compact binary format, so large
+numbers of games (for example from selfplay.py) fit on disk cheaply and
+can be replayed one at a time.
+
+Layout (little endian):
+    file header: magic 'OWGR', version, pits per side, initial stones per pit, flags
+    per game:    number of plies (uint16), one byte per ply (the pit index, PASS for a pass),
+                 then, if the file is annotated, one int16 evaluation and one uint16
+                 thinking time in milliseconds per ply
+
+Games always start from the initial position of the variant with
+Player 0 to move; positions are rebuilt by replaying the moves through
+rules.apply_move.
+"""
+
+import struct
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Sequence, Tuple
+from board import Board
+from rules import apply_move
+
+MAGIC = b"OWGR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBB")
+GAME_HEADER = struct.Struct("<H")
+# Flag bit of annotated files (per ply evaluation and time)
+ANNOTATED = 1
+# Move byte of a pass (the player to move had no legal move)
+PASS = 0xFF
+MAX_PLIES = 0xFFFF
+
+
+class GameRecord(NamedTuple):
+    """
+    One recorded game.
+
+    Attributes:
+        moves (bytes): Pit index of every ply (PASS for a pass).
+        evals (Optional[Tuple[int, ...]]): Evaluation of every ply from the mover's point of view, if annotated.
+        times_ms (Optional[Tuple[int, ...]]): Thinking time of every ply in milliseconds, if annotated.
+    """
+    moves: bytes
+    evals: Optional[Tuple[int, ...]] = None
+    times_ms: Optional[Tuple[int, ...]] = None
+
+
+class GameRecordWriter:
+    """
+    Appends games to a record file one at a time.
+
+    Use it as a context manager, or call close when done.
+
+    Attributes:
+        path (str): The file written.
+        pits_per_side (int): Pits per player of the recorded variant.
+        initial_stones (int): Starting stones per pit of the recorded variant.
+        annotated (bool): True if every ply carries an evaluation and a time.
+        games (int): Games written by this writer.
+    """
+
+    def __init__(self, path: str, pits_per_side: int = 6, initial_stones: int = 4, annotated: bool = False):
+        """
+        Create the file and write its header.
+
+        Args:
+            path (str): Target file path (overwritten).
+            pits_per_side (int, optional): Pits per player. Defaults to 6.
+            initial_stones (int, optional): Stones per pit. Defaults to 4.
+            annotated (bool, optional): Store an evaluation and a time per ply. Defaults to False.
+        """
+        self.path = path
+        self.pits_per_side = pits_per_side
+        self.initial_stones = initial_stones
+        self.annotated = annotated
+        self.games = 0
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, pits_per_side, initial_stones,
+                                     ANNOTATED if annotated else 0))
+
+    def write_game(self, moves: Sequence[int], evals: Optional[Sequence[int]] = None,
+                   times_ms: Optional[Sequence[float]] = None) -> None:
+        """
+        Append one game.
+
+        Args:
+            moves (Sequence[int]): Pit index of every ply, -1 or PASS for a pass.
+            evals (Optional[Sequence[int]], optional): Evaluation per ply (clamped to int16). Defaults to zeros.
+            times_ms (Optional[Sequence[float]], optional): Milliseconds per ply (clamped to uint16).
+                Defaults to zeros.
+
+        Raises:
+            ValueError: If the game is too long or the annotations do not match the moves.
+        """
+        plies = len(moves)
+        if plies > MAX_PLIES:
+            raise ValueError(f"A game record holds at most {MAX_PLIES} plies.")
+        f = self._file
+        f.write(GAME_HEADER.pack(plies))
+        f.write(bytes(PASS if move < 0 else move for move in moves))
+        if self.annotated:
+            evals = [0] * plies if evals is None else evals
+            times_ms = [0] * plies if times_ms is None else times_ms
+            if len(evals) != plies or len(times_ms) != plies:
+                raise ValueError("evals and times_ms need one value per ply.")
+            f.write(struct.pack(f"<{plies}h", *(min(max(int(v), -0x8000), 0x7FFF) for v in evals)))
+            f.write(struct.pack(f"<{plies}H", *(min(max(int(round(t)), 0), 0xFFFF) for t in times_ms)))
+        self.games += 1
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        self._file.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class GameRecordReader:
+    """
+    Streams the games of a record file; only the game being read is held in memory.
+
+    Attributes:
+        path (str): The file read.
+        pits_per_side (int): Pits per player of the recorded variant.
+        initial_stones (int): Starting stones per pit of the recorded variant.
+        annotated (bool): True if every ply carries an evaluation and a time.
+    """
+
+    def __init__(self, path: str):
+        """
+        Read the file header.
+
+        Args:
+            path (str): Path of the record file.
+
+        Raises:
+            ValueError: If the file is not a game record of this version.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is not an Oware game record.")
+        magic, version, pits_per_side, initial_stones, flags = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} Oware game record.")
+        self.pits_per_side = pits_per_side
+        self.initial_stones = initial_stones
+        self.annotated = bool(flags & ANNOTATED)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        """
+        Yield the games in file order.
+
+        Raises:
+            ValueError: If the file ends inside a game.
+        """
+        with open(self.path, "rb") as f:
+            f.seek(HEADER.size)
+            while True:
+                header = f.read(GAME_HEADER.size)
+                if not header:
+                    return
+                if len(header) != GAME_HEADER.size:
+                    raise ValueError(f"{self.path} is truncated.")
+                plies, = GAME_HEADER.unpack(header)
+                body = f.read(plies * (5 if self.annotated else 1))
+                if len(body) != plies * (5 if self.annotated else 1):
+                    raise ValueError(f"{self.path} is truncated.")
+                if not self.annotated:
+                    yield GameRecord(body)
+                    continue
+                evals = struct.unpack_from(f"<{plies}h", body, plies)
+                times = struct.unpack_from(f"<{plies}H", body, 3 * plies)
+                yield GameRecord(body[:plies], evals, times)
+
+    def positions(self, game: GameRecord) -> Iterator[Tuple[Board, int]]:
+        """
+        Replay a game, yielding the position before every ply and the final one.
+
+        The same Board is updated in place between yields; clone it to keep a position.
+
+        Args:
+            game (GameRecord): A game from this reader.
+
+        Yields:
+            Tuple[Board, int]: (Board, player to move).
+
+        Raises:
+            ValueError: If a recorded move is illegal.
+        """
+        board = Board(self.pits_per_side, self.initial_stones)
+        player = 0
+        for ply, move in enumerate(game.moves):
+            yield board, player
+            if move != PASS and not apply_move(board, player, move):
+                raise ValueError(f"Illegal move {move} at ply {ply} in {self.path}.")
+            player = 1 - player
+        yield board, player
+
+    def boards(self) -> Iterator[Tuple[Board, int]]:
+        """
+        Replay every game of the file, yielding each position in turn.
+
+        Yields:
+            Tuple[Board, int]: (Board, player to move), updated in place as in positions.
+        """
+        for game in self:
+            yield from self.positions(game)
+
@@ -7,10 +7,14 @@ It integrates the Board, Rules, CPU, and SessionManager into a Tkinter interface
 
 import os
 import tkinter as tk
+from typing import Optional
 from tkinter import messagebox, filedialog
 from board import Board
 import rules
 from cpu import CPUPlayer
+from mcts import MCTSPlayer
+from ponder import Ponderer
+from search_thread import SearchThread
 from sessions import SessionManager
 import session_ui
 
@@ -18,6 +22,11 @@ PIT_RADIUS = 56
 PIT_SPACING = 22
 CANVAS_PAD_X = 28
 FLASH_MS = 140  
+THINK_POLL_MS = 50
+# Thinking time choices for the CPU, in milliseconds
+THINK_TIMES = {"0.5 s": 500, "1 s": 1000, "2 s": 2000, "5 s": 5000}
+# Extra time before a search that overruns its budget is told to stop
+THINK_GRACE_MS = 250
 
 N_PITS = 6
 WINDOW_WIDTH = (PIT_RADIUS * 2 + PIT_SPACING) * N_PITS + CANVAS_PAD_X * 2
@@ -50,13 +59,18 @@ class SimpleOwareGUI:
         self.vs_ai = False
         self.ai_difficulty = "Medium" 
         self.cpu_player = None 
+        self.ponderer = None
+        self.cpu_job = None
+        self.ai_time_cap_ms = THINK_TIMES["1 s"]
         
         self.history_stack = []
         self.redo_stack = []
+        self.legal_results = {}
+        self.pending_result = None
         
         base = os.path.dirname(__file__)
-        session_file = os.path.join(base, "last_session.json")
-        self.session = SessionManager(autosave_path=session_file)
+        session_log = os.path.join(base, "session_log.jsonl")
+        self.session = SessionManager(log_path=session_log)
 
         self.show_menu()
 
@@ -78,10 +92,15 @@ class SimpleOwareGUI:
         tk.Button(ai_frame, text="vs AI", command=lambda: self.start_game(True), **btn_style).pack(side="top")
         
         self.diff_var = tk.StringVar(value="Medium")
-        diff_menu = tk.OptionMenu(ai_frame, self.diff_var, "Easy", "Medium", "Hard")
+        diff_menu = tk.OptionMenu(ai_frame, self.diff_var, "Easy", "Medium", "Hard", "MCTS")
         diff_menu.config(width=21, font=("Helvetica", 10))
         diff_menu.pack(side="bottom", pady=2)
 
+        self.think_var = tk.StringVar(value="1 s")
+        think_menu = tk.OptionMenu(ai_frame, self.think_var, *THINK_TIMES)
+        think_menu.config(width=21, font=("Helvetica", 10))
+        think_menu.pack(side="bottom", pady=2)
+
         tk.Button(self.menu_frame, text="Load Session", command=self._load_session_dialog, **btn_style).pack(pady=6)
         tk.Button(self.menu_frame, text="Save Session", command=self._save_session_dialog, **btn_style).pack(pady=6)
         tk.Button(self.menu_frame, text="View Stats", command=self._show_stats, **btn_style).pack(pady=6)
@@ -97,9 +116,10 @@ class SimpleOwareGUI:
         """
         self.vs_ai = vs_ai
         self.ai_difficulty = self.diff_var.get()
+        self.ai_time_cap_ms = THINK_TIMES[self.think_var.get()]
 
         if vs_ai:
-            self.cpu_player = CPUPlayer(player_id=1, difficulty=self.ai_difficulty) 
+            self._create_cpu_player()
         
         self.history_stack = []
         self.redo_stack = []
@@ -108,6 +128,16 @@ class SimpleOwareGUI:
         self._setup_game_ui()
         self._draw_board()
 
+    def _create_cpu_player(self) -> None:
+        """Build the AI player (and its ponderer) for ai_difficulty and ai_time_cap_ms."""
+        if self.ai_difficulty == "MCTS":
+            self.cpu_player = MCTSPlayer(player_id=1, time_budget_ms=self.ai_time_cap_ms)
+            self.ponderer = None
+        else:
+            self.cpu_player = CPUPlayer(player_id=1, difficulty=self.ai_difficulty,
+                                        time_budget_ms=self.ai_time_cap_ms, collect_stats=True)
+            self.ponderer = Ponderer(self.cpu_player)
+
     def _setup_game_ui(self) -> None:
         """Construct the game interface."""
         self.top_score = tk.Label(self.root, text="P1: 0", font=("Helvetica", 14, "bold"))
@@ -122,6 +152,9 @@ class SimpleOwareGUI:
         self.status = tk.Label(self.root, text="Player 0's turn", font=("Helvetica", 10))
         self.status.pack()
 
+        self.stats_label = tk.Label(self.root, text="", font=("Helvetica", 9), fg="gray")
+        self.stats_label.pack()
+
         self.undo_frame = tk.Frame(self.root)
         self.undo_frame.pack(pady=(5, 5))
         
@@ -146,20 +179,21 @@ class SimpleOwareGUI:
         self.canvas.tag_bind("pit", "<Button-1>", self._on_pit_click)
         self._draw_board()
 
-    def save_state(self) -> None:
-        """Push current state to history stack for undo to work."""
-        state = {
-            'board': self.board.clone(),
-            'player': self.player,
-            'scores': list(self.board.scores)
-        }
-        self.history_stack.append(state)
+    def save_state(self, record: Optional[rules.UndoRecord] = None) -> None:
+        """
+        Push the move just played to the history stack for undo to work.
+
+        Args:
+            record (Optional[rules.UndoRecord]): Undo record of the move, or None for a pass.
+        """
+        self.history_stack.append((self.player, record))
         self.redo_stack.clear()
         self._update_undo_buttons()
 
     def perform_undo(self) -> None:
         """Revert game state to the previous move."""
         if not self.history_stack or self.animating: return
+        self._cancel_cpu()
         
         # if vs AI we undo 2 steps
         steps = 2 if (self.vs_ai and self.player == 0 and len(self.history_stack) >= 2) else 1
@@ -167,18 +201,12 @@ class SimpleOwareGUI:
 
         for _ in range(steps):
             if not self.history_stack: break
-            
-            current = {
-                'board': self.board.clone(),
-                'player': self.player,
-                'scores': list(self.board.scores)
-            }
-            self.redo_stack.append(current)
-
-            prev = self.history_stack.pop()
-            self.board = prev['board']
-            self.player = prev['player']
-            self.board.scores = prev['scores']
+
+            player, record = self.history_stack.pop()
+            if record is not None:
+                rules.unmake_move(self.board, record)
+            self.player = player
+            self.redo_stack.append((player, record))
 
         self._draw_board()
         self._update_undo_buttons()
@@ -186,22 +214,20 @@ class SimpleOwareGUI:
     def perform_redo(self) -> None:
         """Reapply a previously undone move."""
         if not self.redo_stack or self.animating: return
+        self._cancel_cpu()
 
-        current = {
-            'board': self.board.clone(),
-            'player': self.player,
-            'scores': list(self.board.scores)
-        }
-        self.history_stack.append(current)
-
-        next_state = self.redo_stack.pop()
-        self.board = next_state['board']
-        self.player = next_state['player']
-        self.board.scores = next_state['scores']
+        player, record = self.redo_stack.pop()
+        if record is not None:
+            record = rules.make_move(self.board, player, record.pit)
+        self.history_stack.append((player, record))
+        self.player = 1 - player
 
         self._draw_board()
         self._update_undo_buttons()
 
+        if self.vs_ai and self.player == self.cpu_player.player_id:
+            self.root.after(500, self._execute_cpu_turn)
+
     def _update_undo_buttons(self) -> None:
         """Enable or disable Undo/Redo buttons based on stack contents."""
         self.btn_undo.config(state="normal" if self.history_stack else "disabled")
@@ -244,9 +270,9 @@ class SimpleOwareGUI:
         mode_text = f" (vs AI - {self.ai_difficulty})" if self.vs_ai else ""
         self.status.config(text=f"Player {self.player}'s turn{mode_text}")
 
-        legal = rules.legal_moves(self.board, self.player)
+        self.legal_results = {r.pit: r for r in rules.generate_moves(self.board, self.player)}
         for idx, (pit, _, _, _) in self.pit_map.items():
-            if idx in legal:
+            if idx in self.legal_results:
                 self.canvas.itemconfigure(pit, width=4, outline="#2e8b57")
             else:
                 owner = self.board.pit_owner(idx)
@@ -268,17 +294,17 @@ class SimpleOwareGUI:
         pit_tag = next((t for t in tags if t.startswith("pit") and t != "pit"), None)
         if not pit_tag: return
         pit_idx = int(pit_tag[3:])
-        legal = rules.legal_moves(self.board, self.player)
         
         # Illegal move feedback
-        if pit_idx not in legal:
+        if pit_idx not in self.legal_results:
             pit, _, _, _ = self.pit_map[pit_idx]
             old = self.canvas.itemcget(pit, "outline")
             self.canvas.itemconfigure(pit, outline="#ff0000", width=4)
             self.root.after(220, lambda: self.canvas.itemconfigure(pit, outline=old, width=3))
             return
         
-        self.save_state()
+        # The human moved: the pondering search can wrap up
+        if self.ponderer: self.ponderer.stop()
         self._animate_and_apply(pit_idx)
 
     def _animate_and_apply(self, pit_index: int) -> None:
@@ -291,10 +317,14 @@ class SimpleOwareGUI:
         seeds = self.board.pits[pit_index].stones
         seq = [pit_index]  
         idx = pit_index
-        for _ in range(seeds):
+        while seeds > 0:
             idx = (idx + 1) % self.board.total_pits
+            if idx == pit_index:
+                continue
             seq.append(idx)
+            seeds -= 1
 
+        self.pending_result = self.legal_results.get(pit_index)
         self.animating = True
         self.canvas.config(cursor="watch")
         
@@ -307,13 +337,15 @@ class SimpleOwareGUI:
     def _flash_sequence(self, seq, pos, source_pit) -> None:
         """Recursive function to handle the frame-by-frame animation."""
         if pos >= len(seq):
-            ok = rules.apply_move(self.board, self.player, source_pit)
-            if not ok:
+            result = self.pending_result
+            self.pending_result = None
+            if result is None or result.pit != source_pit:
                 messagebox.showerror("Illegal move", "Move rejected by rules.")
                 self.animating = False
                 self.canvas.config(cursor="")
                 self._draw_board()
                 return
+            self.save_state(rules.play_result(self.board, self.player, result))
             
             if self.board.is_empty_side(0) or self.board.is_empty_side(1):
                 self.animating = False
@@ -351,34 +383,95 @@ class SimpleOwareGUI:
         self.root.after(60, lambda: self._flash_sequence(seq, pos + 1, source_pit))
 
     def _execute_cpu_turn(self) -> None:
-        """Calculate and animate the AI move."""
+        """Start the AI search in the background, or play a pondered move at once."""
         if not self.vs_ai or self.player != self.cpu_player.player_id:
             return
-        
-        self.save_state()
+        if self.cpu_job and not self.cpu_job.cancelled:
+            return
 
-        move = self.cpu_player.get_move(self.board)
-        
+        # Wait (without blocking Tk) until no other search is using the CPU player,
+        # including a cancelled one that has not noticed its stop flag yet
+        pondering = self.ponderer and self.ponderer.busy()
+        if pondering or (self.cpu_job and not self.cpu_job.done()):
+            if pondering:
+                self.ponderer.stop()
+            self.root.after(20, self._execute_cpu_turn)
+            return
+
+        move = self.ponderer.take(self.board) if self.ponderer else None
+        if move is not None:
+            self.stats_label.config(text="pondered move")
+            self._play_cpu_move(move)
+            return
+
+        self.cpu_job = SearchThread(self.cpu_player, self.board)
+        self.canvas.config(cursor="watch")
+        self._poll_cpu_move(self.cpu_job)
+
+    def _poll_cpu_move(self, job: SearchThread) -> None:
+        """
+        Show the thinking indicator until the background search has a move.
+
+        Args:
+            job (SearchThread): The search started by _execute_cpu_turn.
+        """
+        if job is not self.cpu_job or job.cancelled:
+            return
+        if not job.done():
+            elapsed = job.elapsed()
+            if elapsed * 1000.0 > self.ai_time_cap_ms + THINK_GRACE_MS:
+                job.stop()
+            dots = "." * (int(elapsed * 4) % 3 + 1)
+            self.status.config(text=f"CPU is thinking{dots} ({elapsed:.1f}s)")
+            self.root.after(THINK_POLL_MS, lambda: self._poll_cpu_move(job))
+            return
+
+        self.cpu_job = None
+        self.canvas.config(cursor="")
+        stats = self.cpu_player.last_stats
+        self.stats_label.config(text=stats.summary() if stats is not None else "")
+        self._play_cpu_move(job.move)
+
+    def _play_cpu_move(self, move: int) -> None:
+        """
+        Record and animate the move chosen by the AI.
+
+        Args:
+            move (int): The pit to sow, or -1 if the AI has no legal move.
+        """
         if move == -1:
+            self.save_state()
             self.player = 1 - self.player
             self._draw_board()
             return
-        
+
+        if self.ponderer:
+            self.ponderer.start(self.board, move)
         self._animate_and_apply(move)
 
+    def _cancel_cpu(self) -> None:
+        """Drop any running AI search or ponder; their threads finish on their own."""
+        if self.ponderer:
+            self.ponderer.cancel()
+        if self.cpu_job and not self.cpu_job.cancelled:
+            self.cpu_job.cancel()
+            if hasattr(self, 'canvas'):
+                self.canvas.config(cursor="")
+
     def _trigger_endgame(self) -> None:
         """Manually trigger the endgame sequence via button."""
         if self.animating:
             return
+        self._cancel_cpu()
         self._endgame_sweep()
 
     def _endgame_sweep(self) -> None:
         """Collect remaining stones, update scores, and show game over dialog."""
         p0 = sum(self.board.pits[i].stones for i in self.board.player_pit_indices(0))
         p1 = sum(self.board.pits[i].stones for i in self.board.player_pit_indices(1))
-        self.board.scores[0] += p0
-        self.board.scores[1] += p1
-        for i in range(self.board.total_pits): self.board.pits[i].stones = 0
+        self.board.add_score(0, p0)
+        self.board.add_score(1, p1)
+        for i in range(self.board.total_pits): self.board.set_stones(i, 0)
         self._draw_board()
         
         try:
@@ -392,6 +485,7 @@ class SimpleOwareGUI:
         elif self.board.scores[1] > self.board.scores[0]:
             msg = f"Player 1 wins {self.board.scores[1]} - {self.board.scores[0]}"
 
+        self._cancel_cpu()
         messagebox.showinfo("Game Over", msg)
         self._cleanup_game_widgets()
         
@@ -400,6 +494,9 @@ class SimpleOwareGUI:
         self.player = 0
         self.animating = False
         self.vs_ai = False
+        # A new game gets a new CPU player, so a cancelled search can be forgotten
+        self.cpu_job = None
+        self.ponderer = None
         self.cpu_player = None
         self.show_menu()
         return
@@ -407,7 +504,7 @@ class SimpleOwareGUI:
     def _cleanup_game_widgets(self) -> None:
         """Destroy game widgets to clear the screen."""
         widgets = [
-            "top_score", "canvas", "bottom_score", "status", 
+            "top_score", "canvas", "bottom_score", "status", "stats_label",
             "endgame_btn", "save_match_btn", "save_session_btn", "undo_frame"
         ]
         for name in widgets:
@@ -434,6 +531,8 @@ class SimpleOwareGUI:
             "board_pits": [int(p.stones) for p in self.board.pits],
             "player": int(self.player),
             "vs_ai": bool(self.vs_ai),
+            "ai_difficulty": self.ai_difficulty,
+            "ai_time_cap_ms": self.ai_time_cap_ms,
         }
         try:
             import json
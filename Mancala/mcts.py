@@ -0,0 +1,365 @@
+"""
+mcts.py
+
+This implements a Monte Carlo Tree Search opponent.
+MCTSPlayer grows a UCT tree over packed states (see state.py) and scores
+leaves with random playouts played to the end of the game. Playouts run
+on packed integers one at a time, or in batches through batch_rules.py
+when NumPy is installed and playouts_per_leaf is above 1. The subtree of
+the position actually reached is kept between moves.
+
+It has the same get_move(board) interface as CPUPlayer, so the GUI and
+selfplay.py can use either.
+"""
+
+import math
+import random
+import time
+from typing import Dict, List, Optional
+from board import Board
+from rules import legal_moves
+import state as packed
+from search_stats import SearchStats
+
+# UCT exploration constant (sqrt(2) for results in [0, 1])
+EXPLORATION = 1.4
+# Plies after which a playout is stopped and swept
+MAX_PLAYOUT_PLIES = 200
+
+
+class Node:
+    """
+    One position of the search tree.
+
+    Attributes:
+        state (int): The packed position.
+        player (int): Player to move.
+        parent (Optional[Node]): Node this one was expanded from.
+        move (Optional[int]): Pit played to reach this node from its parent.
+        children (List[Node]): Expanded children.
+        untried (List[Tuple[int, int, int]]): Children of state.children not expanded yet.
+        visits (int): Playouts through this node.
+        wins (float): Results of those playouts for the player who moved into this node.
+    """
+
+    __slots__ = ("state", "player", "parent", "move", "children", "untried", "visits", "wins")
+
+    def __init__(self, state: int, player: int, pits_per_side: int,
+                 parent: Optional["Node"] = None, move: Optional[int] = None):
+        """
+        Initialize a leaf.
+
+        Args:
+            state (int): The packed position.
+            player (int): Player to move.
+            pits_per_side (int): Pits per player.
+            parent (Optional[Node], optional): Parent node. Defaults to None (root).
+            move (Optional[int], optional): Pit played from the parent. Defaults to None.
+        """
+        self.state = state
+        self.player = player
+        self.parent = parent
+        self.move = move
+        self.children: List[Node] = []
+        self.untried = packed.children(state, player, pits_per_side) if not _game_over(state, pits_per_side) else []
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration: float) -> "Node":
+        """
+        Pick the child with the highest UCT value.
+
+        Args:
+            exploration (float): Weight of the exploration term.
+
+        Returns:
+            Node: The selected child.
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_visits / c.visits))
+
+
+def _game_over(state: int, pits_per_side: int) -> bool:
+    """Return True if either side is empty or a player holds more than half the seeds."""
+    if not state & packed.side_mask(0, pits_per_side) or not state & packed.side_mask(1, pits_per_side):
+        return True
+    s0 = packed.score(state, 0, pits_per_side)
+    s1 = packed.score(state, 1, pits_per_side)
+    total = s0 + s1 + packed.side_total(state, 0, pits_per_side) + packed.side_total(state, 1, pits_per_side)
+    return 2 * s0 > total or 2 * s1 > total
+
+
+def _result(state: int, pits_per_side: int) -> float:
+    """Return Player 0's result (1, 0.5 or 0) after each player sweeps their own side."""
+    diff = (packed.score(state, 0, pits_per_side) + packed.side_total(state, 0, pits_per_side)
+            - packed.score(state, 1, pits_per_side) - packed.side_total(state, 1, pits_per_side))
+    return 1.0 if diff > 0 else 0.0 if diff < 0 else 0.5
+
+
+class MCTSPlayer:
+    """
+    An AI player using UCT Monte Carlo Tree Search.
+
+    Attributes:
+        player_id (int): The AI player index.
+        difficulty (str): Always 'MCTS' (shown in the GUI).
+        iterations (Optional[int]): Playouts per move; None uses only the time budget.
+        time_budget_ms (Optional[float]): Thinking time per move; None uses only the iteration budget.
+        exploration (float): UCT exploration constant.
+        playouts_per_leaf (int): Playouts per expanded leaf; above 1 they run batched on NumPy.
+        reuse_tree (bool): Keep the subtree of the reached position between moves.
+        principal_variation (List[int]): Most visited line from the last search.
+        last_score (Optional[float]): Win rate of the chosen move for the AI.
+        last_stats (Optional[SearchStats]): Iterations, tree depth and time of the last move.
+        stop_requested (bool): Set from another thread to end the running search early.
+    """
+
+    def __init__(self, player_id: int = 1, iterations: Optional[int] = None,
+                 time_budget_ms: Optional[float] = 1000, exploration: float = EXPLORATION,
+                 playouts_per_leaf: int = 1, reuse_tree: bool = True, seed: Optional[int] = None):
+        """
+        Initialize the MCTS player.
+
+        Args:
+            player_id (int, optional): ID of the AI player. Default is 1.
+            iterations (Optional[int], optional): Playouts per move. Default is None (time only).
+            time_budget_ms (Optional[float], optional): Milliseconds per move. Default is 1000.
+            exploration (float, optional): UCT exploration constant. Default is EXPLORATION.
+            playouts_per_leaf (int, optional): Playouts per leaf, batched when above 1. Default is 1.
+            reuse_tree (bool, optional): Keep the tree between moves. Default is True.
+            seed (Optional[int], optional): Seed of the playout random generator.
+        """
+        if iterations is None and time_budget_ms is None:
+            raise ValueError("MCTSPlayer needs an iteration or a time budget.")
+        self.player_id = player_id
+        self.difficulty = "MCTS"
+        self.iterations = iterations
+        self.time_budget_ms = time_budget_ms
+        self.exploration = exploration
+        self.playouts_per_leaf = playouts_per_leaf
+        self.reuse_tree = reuse_tree
+        self.principal_variation: List[int] = []
+        self.last_score: Optional[float] = None
+        self.last_stats: Optional[SearchStats] = None
+        self.stop_requested = False
+        self._rng = random.Random(seed)
+        self._np_rng = None
+        self._root: Optional[Node] = None
+        self._pits_per_side = 6
+
+    def new_game(self) -> None:
+        """Drop the tree kept from the previous game."""
+        self._root = None
+
+    def close(self) -> None:
+        """Nothing to release (same interface as CPUPlayer)."""
+
+    def has_legal_moves(self, board: Board) -> bool:
+        """
+        Check if the AI has any legal moves available.
+
+        Args:
+            board (Board): Current board.
+
+        Returns:
+            bool: True if legal moves exist, False if not.
+        """
+        return len(legal_moves(board, self.player_id)) > 0
+
+    def get_move(self, board: Board) -> int:
+        """
+        Search the board and return the most visited move.
+
+        Args:
+            board (Board): The current game board.
+
+        Returns:
+            int: The index of the selected pit to move, or -1 if no moves exist.
+        """
+        legal = legal_moves(board, self.player_id)
+        if not legal:
+            return -1
+        if len(legal) == 1:
+            # Forced move: no playouts, but the stats must not be the previous move's
+            self.last_score = None
+            self.principal_variation = [legal[0]]
+            stats = SearchStats()
+            stats.source = "mcts"
+            stats.move = legal[0]
+            stats.depth = 1
+            self.last_stats = stats
+            return legal[0]
+
+        pps = board.pits_per_side
+        self._pits_per_side = pps
+        root = self._find_root(packed.pack(board))
+        start = time.perf_counter()
+        deadline = None if self.time_budget_ms is None else start + self.time_budget_ms / 1000.0
+        done = 0
+        while self.iterations is None or done < self.iterations:
+            if done and (self.stop_requested or (deadline is not None and time.perf_counter() >= deadline)):
+                break
+            self._iterate(root)
+            done += 1
+
+        best = max(root.children, key=lambda c: c.visits)
+        self.last_score = best.wins / best.visits
+        self.principal_variation = self._most_visited_line(root)
+        stats = SearchStats()
+        stats.source = "mcts"
+        stats.move = best.move
+        stats.nodes = done
+        stats.depth = len(self.principal_variation)
+        stats.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.last_stats = stats
+
+        # Keep the subtree after our move; the opponent's reply is looked up next time
+        self._root = best if self.reuse_tree else None
+        return best.move if best.move in legal else random.choice(legal)
+
+    def _find_root(self, state: int) -> Node:
+        """
+        Reuse the kept subtree if it contains the position, else start a new tree.
+
+        Args:
+            state (int): The packed position, AI to move.
+
+        Returns:
+            Node: The root to search from.
+        """
+        kept = self._root
+        node = None
+        if kept is not None:
+            candidates = [kept] + kept.children
+            for node in candidates:
+                if node.state == state and node.player == self.player_id:
+                    node.parent = None
+                    break
+            else:
+                node = None
+        if node is None:
+            node = Node(state, self.player_id, self._pits_per_side)
+        if not node.children and not node.untried:
+            # A decided position is still played out to the end, so the root always expands
+            node.untried = packed.children(state, self.player_id, self._pits_per_side)
+        return node
+
+    def _iterate(self, root: Node) -> None:
+        """Run selection, expansion, simulation and backpropagation once."""
+        pps = self._pits_per_side
+        node = root
+        while not node.untried and node.children:
+            node = node.select_child(self.exploration)
+        if node.untried:
+            move, child, _ = node.untried.pop(self._rng.randrange(len(node.untried)))
+            leaf = Node(child, 1 - node.player, pps, node, move)
+            node.children.append(leaf)
+            node = leaf
+
+        results = self._playouts(node.state, node.player)
+        visits = len(results)
+        wins0 = sum(results)
+        while node is not None:
+            node.visits += visits
+            # wins count for the player who moved into the node
+            node.wins += wins0 if node.player == 1 else visits - wins0
+            node = node.parent
+
+    def _playouts(self, state: int, player: int) -> List[float]:
+        """
+        Play random games from a position.
+
+        Args:
+            state (int): The packed position.
+            player (int): Player to move.
+
+        Returns:
+            List[float]: Player 0's result of every playout.
+        """
+        if self.playouts_per_leaf > 1:
+            try:
+                return self._batch_playouts(state, player, self.playouts_per_leaf)
+            except ImportError:
+                self.playouts_per_leaf = 1
+        pps = self._pits_per_side
+        rng = self._rng
+        mask0, mask1 = packed.side_mask(0, pps), packed.side_mask(1, pps)
+        score_shift = packed.FIELD_BITS * 2 * pps
+        half = sum(packed.stones(state, i) for i in range(2 * pps))
+        half = (half + packed.score(state, 0, pps) + packed.score(state, 1, pps)) // 2
+        for _ in range(MAX_PLAYOUT_PLIES):
+            if not state & mask0 or not state & mask1:
+                break
+            scores = state >> score_shift
+            if scores & packed.FIELD_MASK > half or scores >> packed.FIELD_BITS > half:
+                break
+            child = packed.random_child(state, player, pps, rng)
+            if child is None:
+                break
+            state = child
+            player = 1 - player
+        return [_result(state, pps)]
+
+    def _batch_playouts(self, state: int, player: int, count: int) -> List[float]:
+        """
+        Play count random games from a position in one BatchBoards.
+
+        Args:
+            state (int): The packed position.
+            player (int): Player to move.
+            count (int): Number of playouts.
+
+        Returns:
+            List[float]: Player 0's result of every playout.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        import numpy as np
+        from batch_rules import BatchBoards
+
+        pps = self._pits_per_side
+        if self._np_rng is None:
+            self._np_rng = np.random.default_rng(self._rng.randrange(1 << 32))
+        batch = BatchBoards(count, pps, 0)
+        batch.pits[:] = [packed.stones(state, i) for i in range(2 * pps)]
+        batch.scores[:] = [packed.score(state, 0, pps), packed.score(state, 1, pps)]
+        batch.player[:] = player
+        half = (int(batch.pits[0].sum()) + int(batch.scores[0].sum())) // 2
+        for _ in range(MAX_PLAYOUT_PLIES):
+            over = batch.finished() | (batch.scores.max(axis=1) > half)
+            if over.all():
+                break
+            moves = batch.random_moves(self._np_rng)
+            moves[over] = -1
+            batch.play(moves, check=False)
+        batch.sweep(np.ones(count, dtype=bool))
+        diff = batch.scores[:, 0].astype(int) - batch.scores[:, 1].astype(int)
+        return (np.sign(diff) * 0.5 + 0.5).tolist()
+
+    def _most_visited_line(self, root: Node) -> List[int]:
+        """Follow the most visited children from the root."""
+        line = []
+        node = root
+        while node.children:
+            node = max(node.children, key=lambda c: c.visits)
+            line.append(node.move)
+        return line
+
+    def tree_size(self) -> Dict[str, int]:
+        """
+        Count the nodes kept for the next move.
+
+        Returns:
+            Dict[str, int]: 'nodes' and 'visits' of the kept subtree.
+        """
+        if self._root is None:
+            return {"nodes": 0, "visits": 0}
+        nodes = 0
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            nodes += 1
+            stack.extend(node.children)
+        return {"nodes": nodes, "visits": self._root.visits}
@@ -0,0 +1,135 @@
+"""
+ponder.py
+
+This lets the CPU think on the opponent's time.
+After the CPU picks a move, a background thread plays that move and the
+reply the CPU expects (second move of its principal variation) and searches
+the resulting position. This fills the transposition table while the human
+is thinking or watching the sowing animation. If the human plays the
+expected reply, the pondered move can be played at once.
+
+The thread never touches Tk. The GUI only calls the non-blocking methods
+below from the main loop.
+"""
+
+import threading
+import time
+from typing import Optional
+from board import Board
+import state as packed
+
+
+class Ponderer:
+    """
+    Runs and cancels background searches for one CPUPlayer.
+
+    Only one search may use the CPUPlayer at a time, so the GUI must wait
+    until busy() is False before calling get_move again.
+
+    Attributes:
+        cpu (CPUPlayer): The player whose search and tables are used.
+        hits (int): Pondered positions the human actually reached.
+        misses (int): Pondered positions the human avoided.
+    """
+
+    def __init__(self, cpu):
+        """
+        Initialize the Ponderer.
+
+        Args:
+            cpu (CPUPlayer): The CPU player to ponder for.
+        """
+        self.cpu = cpu
+        self.hits = 0
+        self.misses = 0
+        self._thread: Optional[threading.Thread] = None
+        self._target: Optional[int] = None
+        self._move: Optional[int] = None
+        self._elapsed_ms = 0.0
+
+    def start(self, board: Board, cpu_move: int) -> bool:
+        """
+        Start pondering on the position expected after cpu_move and the predicted reply.
+
+        Args:
+            board (Board): The board before cpu_move is played.
+            cpu_move (int): The move the CPU just chose.
+
+        Returns:
+            bool: True if a background search was started.
+        """
+        cpu = self.cpu
+        pv = cpu.principal_variation
+        if cpu.difficulty != "Hard" or self.busy() or len(pv) < 2 or pv[0] != cpu_move:
+            return False
+        pps = board.pits_per_side
+        after_cpu = packed.apply_move(packed.pack(board), cpu.player_id, cpu_move, pps)
+        if after_cpu is None:
+            return False
+        target = packed.apply_move(after_cpu, 1 - cpu.player_id, pv[1], pps)
+        if target is None or not packed.children(target, cpu.player_id, pps):
+            return False
+
+        self._target = target
+        self._move = None
+        cpu.pits_per_side = pps
+        cpu.stop_requested = False
+        self._thread = threading.Thread(target=self._run, args=(target,), daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self, target: int) -> None:
+        """Background thread body: search until stopped or max_depth is reached."""
+        started = time.perf_counter()
+        try:
+            self._move = self.cpu._iterative_deepening(target, use_budget=False)
+        finally:
+            self._elapsed_ms = (time.perf_counter() - started) * 1000.0
+            self.cpu.stop_requested = False
+
+    def busy(self) -> bool:
+        """
+        Check whether the background search is still running.
+
+        Returns:
+            bool: True while the thread is alive.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self) -> None:
+        """Ask the background search to finish (non blocking); its result is kept."""
+        if self.busy():
+            self.cpu.stop_requested = True
+
+    def cancel(self) -> None:
+        """Stop the background search and drop its result."""
+        self.stop()
+        self._target = None
+        self._move = None
+
+    def take(self, board: Board) -> Optional[int]:
+        """
+        Return the pondered move if the board is the pondered position.
+
+        The move is only used when the search had at least the CPU's normal
+        time budget; otherwise get_move runs with the warm table instead.
+
+        Args:
+            board (Board): The current board, CPU to move.
+
+        Returns:
+            Optional[int]: The move to play at once, or None.
+        """
+        if self.busy() or self._target is None:
+            return None
+        target, move = self._target, self._move
+        self._target = None
+        self._move = None
+        if packed.pack(board) != target:
+            self.misses += 1
+            return None
+        self.hits += 1
+        budget = self.cpu.time_budget_ms
+        if move is None or (budget is not None and self._elapsed_ms < budget):
+            return None
+        return move
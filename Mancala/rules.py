@@ -6,8 +6,40 @@ It handles move validation, capturing logic, and simulation of moves
 (without permanently changing the board state).
 """
 
-from typing import List, Tuple
-from board import Board
+from typing import List, NamedTuple, Optional, Tuple
+from board import Board, sow_table
+
+
+class MoveResult(NamedTuple):
+    """
+    The outcome of sowing and capturing from one pit, computed once.
+
+    Attributes:
+        pit (int): The pit the move starts from.
+        pits (List[int]): Seed counts of every pit after sowing and capturing.
+        captured (int): Seeds captured by the mover.
+        last_idx (int): Index of the pit the last seed landed in.
+    """
+    pit: int
+    pits: List[int]
+    captured: int
+    last_idx: int
+
+
+class UndoRecord(NamedTuple):
+    """
+    What a move changed, enough to take it back in place.
+
+    Attributes:
+        player (int): The player who made the move.
+        pit (int): The pit the move started from.
+        changes (Tuple[Tuple[int, int], ...]): (Pit index, seeds before the move) of every touched pit.
+        captured (int): Seeds added to the player's score.
+    """
+    player: int
+    pit: int
+    changes: Tuple[Tuple[int, int], ...]
+    captured: int
 
 
 def opponent(p: int) -> int:
@@ -27,6 +59,8 @@ def _sow_list(pits: List[int], start_idx: int) -> Tuple[int, List[int]]:
     """
     Simulate sowing seeds on a raw list of integers.
 
+    The gains come from the shared sowing table, so this is a single vector add.
+
     Args:
         pits (List[int]): List of seed/stone counts.
         start_idx (int): Index to start sowing from.
@@ -34,15 +68,11 @@ def _sow_list(pits: List[int], start_idx: int) -> Tuple[int, List[int]]:
     Returns:
         Tuple[int, List[int]]: (Index where last stone landed, updated list).
     """
-    pits = pits.copy()
     seeds = pits[start_idx]
+    delta, last_idx = sow_table(len(pits)).lookup(start_idx, seeds)
+    pits = [p + gain for p, gain in zip(pits, delta)]
     pits[start_idx] = 0
-    idx = start_idx
-    while seeds > 0:
-        idx = (idx + 1) % len(pits)
-        pits[idx] += 1
-        seeds -= 1
-    return idx, pits
+    return last_idx, pits
 
 
 def _owner_of(idx: int, pits_per_side: int) -> int:
@@ -59,38 +89,60 @@ def _owner_of(idx: int, pits_per_side: int) -> int:
     return 0 if idx < pits_per_side else 1
 
 
-def _capture_on_list(pits: List[int], last_idx: int, mover: int, pits_per_side: int) -> Tuple[int, List[int]]:
+def _simulate(pits: List[int], pit: int, player: int, pits_per_side: int) -> Tuple[MoveResult, int]:
     """
-    Simulate the capture phase on a raw list of integers (internal helper).
+    Sow and capture from one pit on a raw list of integers (internal helper).
 
     Args:
-        pits (List[int]): Current board state as integers.
-        last_idx (int): Index where the last stone landed.
-        mover (int): Player who made the move.
+        pits (List[int]): Current board state as integers (left untouched).
+        pit (int): Index to sow from.
+        player (int): Player who makes the move.
         pits_per_side (int): Board dimension.
 
     Returns:
-        Tuple[int, List[int]]: (Total captured stones -> for scoring porposes, updated list).
+        Tuple[MoveResult, int]: (The move outcome, seeds left on the opponent's side).
     """
-    pits = pits.copy()
+    last_idx, after_sow = _sow_list(pits, pit)
+    opp = opponent(player)
     captured = 0
-    opp = opponent(mover)
-    
-    # Check if last stone landed in opponent's side
     if _owner_of(last_idx, pits_per_side) == opp:
+        low = pits_per_side * opp
         i = last_idx
-        while True:
-            stones = pits[i]
-            if stones in (2, 3):
-                captured += stones
-                pits[i] = 0
-                i = (i - 1) % len(pits)
-                # Stop if we move out of opponent's territory
-                if _owner_of(i, pits_per_side) != opp:
-                    break
-            else:
-                break
-    return captured, pits
+        while i >= low and after_sow[i] in (2, 3):
+            captured += after_sow[i]
+            after_sow[i] = 0
+            i -= 1
+    opp_total = sum(after_sow[pits_per_side * opp:pits_per_side * (opp + 1)])
+    return MoveResult(pit, after_sow, captured, last_idx), opp_total
+
+
+def generate_moves(board: Board, player: int) -> List[MoveResult]:
+    """
+    Produce the outcome of every legal move, simulating each pit exactly once.
+
+    Grand Slam rule: a move that captures all opponent
+    seeds is illegal if it leaves the opponent with no moves.
+
+    Args:
+        board (Board): The current game board.
+        player (int): The player ID (0 or 1).
+
+    Returns:
+        List[MoveResult]: One entry per legal move, in pit index order.
+    """
+    plain = [p.stones for p in board.pits]
+    results = []
+    legal = []
+    for pit in board.player_pit_indices(player):
+        if plain[pit] == 0:
+            continue
+        result, opp_total = _simulate(plain, pit, player, board.pits_per_side)
+        results.append(result)
+        if opp_total > 0:
+            legal.append(result)
+
+    # If no move allows opponent to play, every non-empty pit stays legal
+    return legal if legal else results
 
 
 def legal_moves(board: Board, player: int) -> List[int]:
@@ -107,79 +159,116 @@ def legal_moves(board: Board, player: int) -> List[int]:
     Returns:
         List[int]: A list of legal pit indices.
     """
-    candidates = [i for i in board.player_pit_indices(player) if board.pits[i].stones > 0]
-    legal = []
-    
-    for pit in candidates:
-        plain = [p.stones for p in board.pits]
-        last_idx, after_sow = _sow_list(plain, pit)
-        captured, after_capture = _capture_on_list(after_sow, last_idx, player, board.pits_per_side)
-        
-        # Check if opponent still has seeds after this move
-        opp_total = sum(after_capture[i] for i in board.player_pit_indices(opponent(player)))
-        
-        if opp_total > 0:
-            legal.append(pit)
-            
-    # If no move allows opponent to play, return all non-empty pits 
-    return legal if legal else candidates
+    return [result.pit for result in generate_moves(board, player)]
 
 
-def apply_move(board: Board, player: int, pit_index: int, simulate_only: bool = False) -> bool:
+def play_result(board: Board, player: int, result: MoveResult) -> UndoRecord:
     """
-    Apply a move to the actual board, updating stones and scores.
+    Write a precomputed move outcome onto the board.
+
+    Only the pits the move changed (sown or captured) touch the hash key.
+
+    Args:
+        board (Board): The game board the result was generated from.
+        player (int): The player who made the move.
+        result (MoveResult): An entry returned by generate_moves.
+
+    Returns:
+        UndoRecord: What to pass to unmake_move to take the move back.
+    """
+    pits = board.pits
+    changes = tuple((i, pits[i].stones) for i, stones in enumerate(result.pits) if pits[i].stones != stones)
+    for i, stones in enumerate(result.pits):
+        board.set_stones(i, stones)
+    board.add_score(player, result.captured)
+    return UndoRecord(player, result.pit, changes, result.captured)
+
+
+def _checked_result(board: Board, player: int, pit_index: int) -> Optional[MoveResult]:
+    """
+    Simulate a move after checking that it is legal.
 
     Args:
         board (Board): The game board.
         player (int): The player ID.
         pit_index (int): The index of the pit selected.
-        simulate_only (bool, optional): If this is True, it validates but does not change state. It's False by default.
 
     Returns:
-        bool: True if the move was valid and applied/simulated, False otherwise.
+        Optional[MoveResult]: The outcome, or None if the move is illegal.
     """
     if pit_index < 0 or pit_index >= board.total_pits:
-        return False
+        return None
     if board.pit_owner(pit_index) != player:
-        return False
+        return None
     if board.pits[pit_index].stones == 0:
-        return False
+        return None
 
-    # Simulate to check Grand Slam rule 
     plain = [p.stones for p in board.pits]
-    last_idx, after_sow = _sow_list(plain, pit_index)
-    captured, after_capture = _capture_on_list(after_sow, last_idx, player, board.pits_per_side)
+    result, opp_after_total = _simulate(plain, pit_index, player, board.pits_per_side)
 
-    opp_after_total = sum(after_capture[i] for i in board.player_pit_indices(opponent(player)))
-    
-    # If opponent has 0 stones after this move, check if we had other options
+    # If opponent has 0 stones after this move, check if we had other options (Grand Slam)
     if opp_after_total == 0:
-        alternatives = [i for i in board.player_pit_indices(player) if board.pits[i].stones > 0 and i != pit_index]
-        for alt in alternatives:
-            plain_alt = [p.stones for p in board.pits]
-            last_alt, after_sow_alt = _sow_list(plain_alt, alt)
-            _, after_capture_alt = _capture_on_list(after_sow_alt, last_alt, player, board.pits_per_side)
-            if sum(after_capture_alt[i] for i in board.player_pit_indices(opponent(player))) > 0:
-                return False
-
-    if simulate_only:
-        return True
-
-    last_idx_real, _ = board.sow_from(pit_index)
-    captured_real = 0
-    
-    if board.pit_owner(last_idx_real) == opponent(player):
-        i = last_idx_real
-        while True:
-            stones_here = board.pits[i].stones
-            if stones_here in (2, 3):
-                captured_real += stones_here
-                board.pits[i].stones = 0
-                i = (i - 1) % board.total_pits
-                if board.pit_owner(i) != opponent(player):
-                    break
-            else:
-                break
-
-    board.scores[player] += captured_real
+        for alt in board.player_pit_indices(player):
+            if alt == pit_index or plain[alt] == 0:
+                continue
+            _, opp_alt_total = _simulate(plain, alt, player, board.pits_per_side)
+            if opp_alt_total > 0:
+                return None
+    return result
+
+
+def apply_move(board: Board, player: int, pit_index: int, simulate_only: bool = False) -> bool:
+    """
+    Apply a move to the actual board, updating stones and scores.
+
+    Args:
+        board (Board): The game board.
+        player (int): The player ID.
+        pit_index (int): The index of the pit selected.
+        simulate_only (bool, optional): If this is True, it validates but does not change state. It's False by default.
+
+    Returns:
+        bool: True if the move was valid and applied/simulated, False otherwise.
+    """
+    result = _checked_result(board, player, pit_index)
+    if result is None:
+        return False
+    if not simulate_only:
+        play_result(board, player, result)
     return True
+
+
+def make_move(board: Board, player: int, pit_index: int) -> Optional[UndoRecord]:
+    """
+    Play a move in place and return what is needed to take it back.
+
+    Lets a caller walk the game tree on one Board instead of cloning it per child.
+
+    Args:
+        board (Board): The game board.
+        player (int): The player ID.
+        pit_index (int): The index of the pit selected.
+
+    Returns:
+        Optional[UndoRecord]: The undo record, or None if the move is illegal (board unchanged).
+    """
+    result = _checked_result(board, player, pit_index)
+    if result is None:
+        return None
+    return play_result(board, player, result)
+
+
+def unmake_move(board: Board, undo: UndoRecord) -> None:
+    """
+    Take back the move described by an undo record.
+
+    Only the pits the move touched are restored; the hash key follows.
+    Moves must be taken back in the reverse order they were made.
+
+    Args:
+        board (Board): The board the move was made on.
+        undo (UndoRecord): The record returned by make_move or play_result.
+    """
+    for i, stones in undo.changes:
+        board.set_stones(i, stones)
+    board.add_score(undo.player, -undo.captured)
@@ -0,0 +1,156 @@
+"""
+search_stats.py
+
+This holds the counters collected during one CPU move.
+A CPUPlayer built with collect_stats=True fills a SearchStats for every
+Hard get_move call and keeps it in last_stats. The stats can be appended
+to a JSON lines file and summarized in one line for the GUI.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+
+class SearchStats:
+    """
+    What the search did for one move.
+
+    Attributes:
+        source (str): 'search', 'parallel', 'book', 'random' or 'mcts' (nodes then counts playouts).
+        move (Optional[int]): The move returned by get_move.
+        score (Optional[int]): Root score from the AI's point of view.
+        nodes (int): Nodes visited (calls of the search function).
+        leaf_evals (int): Nodes scored without expanding them (horizon, finished game, tablebase).
+        cutoffs (List[int]): Beta cutoffs counted by the index of the cutting move in the ordered list.
+        tt_probes (int): Transposition table lookups.
+        tt_hits (int): Lookups that found the position.
+        depth (int): Last fully searched iteration.
+        seldepth (int): Deepest ply visited.
+        iteration_nodes (List[int]): Nodes of each completed iteration (depth 1 first).
+        elapsed_ms (float): Wall time of the move.
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.source = "search"
+        self.move: Optional[int] = None
+        self.score: Optional[int] = None
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.cutoffs: List[int] = []
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.depth = 0
+        self.seldepth = 0
+        self.iteration_nodes: List[int] = []
+        self.elapsed_ms = 0.0
+
+    def record_cutoff(self, index: int) -> None:
+        """
+        Count a beta cutoff.
+
+        Args:
+            index (int): Position of the cutting move in the ordered move list (0 = first).
+        """
+        cutoffs = self.cutoffs
+        while len(cutoffs) <= index:
+            cutoffs.append(0)
+        cutoffs[index] += 1
+
+    def merge(self, other: "SearchStats") -> None:
+        """
+        Add the counters of a search of part of the tree (a root-parallel worker task).
+
+        nodes, depth and iteration_nodes are left to the caller, which counts them per round.
+
+        Args:
+            other (SearchStats): Stats of the partial search.
+        """
+        self.leaf_evals += other.leaf_evals
+        for index, count in enumerate(other.cutoffs):
+            while len(self.cutoffs) <= index:
+                self.cutoffs.append(0)
+            self.cutoffs[index] += count
+        self.tt_probes += other.tt_probes
+        self.tt_hits += other.tt_hits
+        self.seldepth = max(self.seldepth, other.seldepth)
+
+    def effective_branching_factor(self) -> Optional[float]:
+        """
+        Nodes of the last completed iteration divided by those of the one before.
+
+        Returns:
+            Optional[float]: The ratio, or None with fewer than two iterations.
+        """
+        its = self.iteration_nodes
+        if len(its) < 2 or its[-2] == 0:
+            return None
+        return its[-1] / its[-2]
+
+    def first_move_cutoff_rate(self) -> Optional[float]:
+        """
+        Share of cutoffs produced by the first ordered move (a move ordering quality measure).
+
+        Returns:
+            Optional[float]: The share, or None without cutoffs.
+        """
+        total = sum(self.cutoffs)
+        return self.cutoffs[0] / total if total else None
+
+    def to_dict(self) -> Dict:
+        """
+        Return the stats as plain JSON compatible values.
+
+        Returns:
+            Dict: Every attribute plus the derived rates.
+        """
+        ebf = self.effective_branching_factor()
+        first = self.first_move_cutoff_rate()
+        return {
+            "source": self.source,
+            "move": self.move,
+            "score": self.score,
+            "nodes": self.nodes,
+            "leaf_evals": self.leaf_evals,
+            "cutoffs": list(self.cutoffs),
+            "first_move_cutoff_rate": round(first, 4) if first is not None else None,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "depth": self.depth,
+            "seldepth": self.seldepth,
+            "iteration_nodes": list(self.iteration_nodes),
+            "ebf": round(ebf, 3) if ebf is not None else None,
+            "elapsed_ms": round(self.elapsed_ms, 2),
+            "nodes_per_second": round(self.nodes * 1000.0 / self.elapsed_ms) if self.elapsed_ms else None,
+        }
+
+    def log(self, path: str) -> None:
+        """
+        Append the stats to a JSON lines file.
+
+        Args:
+            path (str): File to append to.
+        """
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_dict()) + "\n")
+
+    def summary(self) -> str:
+        """
+        Return a one line description for the GUI status bar.
+
+        Returns:
+            str: Depth, nodes, speed, TT hit rate and branching factor.
+        """
+        if self.source == "mcts":
+            speed = self.nodes / self.elapsed_ms if self.elapsed_ms else 0.0
+            return f"{self.nodes} playouts, {speed:.1f}k/s, line of {self.depth} moves"
+        if self.source != "search" and self.source != "parallel":
+            return f"{self.source} move"
+        ebf = self.effective_branching_factor()
+        hit_rate = 100.0 * self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+        speed = self.nodes / self.elapsed_ms if self.elapsed_ms else 0.0
+        text = (f"depth {self.depth}/{self.seldepth}, {self.nodes} nodes, {speed:.0f}k nps, "
+                f"TT {hit_rate:.0f}%")
+        if ebf is not None:
+            text += f", EBF {ebf:.2f}"
+        return text
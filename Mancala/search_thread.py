@@ -0,0 +1,79 @@
+"""
+search_thread.py
+
+This runs CPUPlayer.get_move off the Tk main thread.
+The GUI starts a SearchThread on a copy of the board and polls it with
+root.after, so the window keeps redrawing and answering clicks while the
+Hard search is running. Cancelling raises the CPU player's stop flag,
+which the search checks every few hundred nodes.
+
+The thread never touches Tk.
+"""
+
+import threading
+import time
+from typing import Optional
+from board import Board
+
+
+class SearchThread:
+    """
+    One get_move call running in a daemon thread.
+
+    Attributes:
+        cpu (CPUPlayer): The player searching.
+        move (Optional[int]): The chosen move once the thread has finished.
+        cancelled (bool): True once cancel() was called; move must then be ignored.
+        started (float): time.perf_counter() at start, for the thinking indicator.
+    """
+
+    def __init__(self, cpu, board: Board):
+        """
+        Start searching a copy of board.
+
+        Args:
+            cpu (CPUPlayer): The CPU player to move. No other search may be using it.
+            board (Board): The current board; it is cloned, so the GUI may change it freely.
+        """
+        self.cpu = cpu
+        self.move: Optional[int] = None
+        self.cancelled = False
+        self.started = time.perf_counter()
+        cpu.stop_requested = False
+        self._thread = threading.Thread(target=self._run, args=(board.clone(),), daemon=True)
+        self._thread.start()
+
+    def _run(self, board: Board) -> None:
+        """Background thread body."""
+        try:
+            self.move = self.cpu.get_move(board)
+        finally:
+            self.cpu.stop_requested = False
+
+    def done(self) -> bool:
+        """
+        Check whether the search has finished.
+
+        Returns:
+            bool: True once the thread has ended.
+        """
+        return not self._thread.is_alive()
+
+    def elapsed(self) -> float:
+        """
+        Seconds since the search started.
+
+        Returns:
+            float: Elapsed wall time.
+        """
+        return time.perf_counter() - self.started
+
+    def stop(self) -> None:
+        """Ask the search to finish now (non blocking); the best move found so far is kept."""
+        if not self.done():
+            self.cpu.stop_requested = True
+
+    def cancel(self) -> None:
+        """Ask the search to stop (non blocking) and mark its result as unwanted."""
+        self.cancelled = True
+        self.stop()
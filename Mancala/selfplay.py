@@ -0,0 +1,271 @@
+"""
+selfplay.py
+
+This runs headless matches between two CPUPlayer configurations.
+Games are spread over a process pool, colors alternate every game, and
+finished games are scored with the same end of game sweep as game.py.
+The result (wins, draws, losses, an Elo estimate with a confidence
+interval and the throughput) is printed as JSON. With --record every game
+is also appended to a binary game record (see gamerecord.py) as soon as
+it finishes, with each ply's evaluation and thinking time, so the games
+played so far survive an interrupted match.
+
+Run it from the Mancala folder, for example:
+
+    python selfplay.py --a '{"difficulty": "Hard", "max_depth": 6}' \
+                       --b '{"difficulty": "Medium"}' --games 1000 --workers 4
+
+A configuration holds CPUPlayer keyword arguments, plus "max_depth" to fix
+the Hard search depth. Hard players default to time_budget_ms None, so
+fixed depth matches are reproducible from --seed. With "engine": "mcts"
+the other keys go to MCTSPlayer instead, for example:
+
+    python selfplay.py --a '{"engine": "mcts", "time_budget_ms": 200}' \
+                       --b '{"difficulty": "Hard", "time_budget_ms": 200}'
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from board import Board
+from cpu import CPUPlayer
+from mcts import MCTSPlayer
+from game import collect_remaining
+from gamerecord import GameRecord, GameRecordWriter
+from rules import apply_move
+
+# Plies after which a game is stopped and swept (endless cycles are possible)
+MAX_PLIES = 400
+# z value of the two sided 95% confidence interval
+Z_95 = 1.96
+# Games queued per worker process, so finished games are handled while the match runs
+QUEUED_PER_WORKER = 4
+
+# CPUPlayers built in this process, keyed by their configuration
+_players: Dict[Tuple[str, int], object] = {}
+
+
+def make_player(config: Dict, player_id: int):
+    """
+    Build a CPUPlayer (or an MCTSPlayer) from a configuration dictionary.
+
+    Args:
+        config (Dict): CPUPlayer keyword arguments, plus an optional "max_depth";
+            or "engine": "mcts" and MCTSPlayer keyword arguments.
+        player_id (int): Seat of the player.
+
+    Returns:
+        CPUPlayer | MCTSPlayer: The player.
+    """
+    kwargs = dict(config)
+    if kwargs.pop("engine", "minimax") == "mcts":
+        return MCTSPlayer(player_id=player_id, **kwargs)
+    max_depth = kwargs.pop("max_depth", None)
+    kwargs.setdefault("time_budget_ms", None if max_depth is not None else 1000)
+    cpu = CPUPlayer(player_id=player_id, **kwargs)
+    if max_depth is not None:
+        cpu.max_depth = max_depth
+    return cpu
+
+
+def _player(config: Dict, player_id: int):
+    """Return this process's player for a configuration and seat, reset for a new game."""
+    key = (json.dumps(config, sort_keys=True), player_id)
+    cpu = _players.get(key)
+    if cpu is None:
+        cpu = _players[key] = make_player(config, player_id)
+    cpu.new_game()
+    return cpu
+
+
+def play_game(config_a: Dict, config_b: Dict, a_first: bool, seed: int,
+              max_plies: int = MAX_PLIES) -> Tuple[int, int, int, GameRecord]:
+    """
+    Play one game between two configurations.
+
+    Args:
+        config_a (Dict): Configuration of player A.
+        config_b (Dict): Configuration of player B.
+        a_first (bool): True if A plays as Player 0 (moves first).
+        seed (int): Seed of the random module for this game.
+        max_plies (int, optional): Move limit. Defaults to MAX_PLIES.
+
+    Returns:
+        Tuple[int, int, int, GameRecord]: (Score of A, score of B, plies played, the moves with
+        the mover's last_score and thinking time of each ply).
+    """
+    random.seed(seed)
+    seats = (0, 1) if a_first else (1, 0)
+    players = [None, None]
+    players[seats[0]] = _player(config_a, seats[0])
+    players[seats[1]] = _player(config_b, seats[1])
+
+    board = Board()
+    player = 0
+    plies = 0
+    moves, evals, times_ms = [], [], []
+    while not collect_remaining(board, force=plies >= max_plies):
+        started = time.perf_counter()
+        move = players[player].get_move(board)
+        if move == -1 or not apply_move(board, player, move):
+            collect_remaining(board, force=True)
+            break
+        score = getattr(players[player], "last_score", None)
+        moves.append(move)
+        evals.append(score if isinstance(score, int) else 0)
+        times_ms.append((time.perf_counter() - started) * 1000.0)
+        player = 1 - player
+        plies += 1
+    record = GameRecord(bytes(moves), tuple(evals), tuple(times_ms))
+    return board.scores[seats[0]], board.scores[seats[1]], plies, record
+
+
+def _finished_games(tasks: List[Tuple], workers: int) -> Iterator[Tuple[int, int, int, GameRecord]]:
+    """
+    Play games and yield their results in the order they finish.
+
+    Only a few games per worker are submitted at a time, so results are not
+    piled up in memory while the rest of the match runs.
+
+    Args:
+        tasks (List[Tuple]): Arguments of play_game, one tuple per game.
+        workers (int): Processes; 1 plays in this process.
+
+    Yields:
+        Tuple[int, int, int, GameRecord]: The result of play_game.
+    """
+    if workers == 1:
+        for task in tasks:
+            yield play_game(*task)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        queue = iter(tasks)
+        pending = {pool.submit(play_game, *task) for task in islice(queue, workers * QUEUED_PER_WORKER)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = next(queue, None)
+                if task is not None:
+                    pending.add(pool.submit(play_game, *task))
+                yield future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def elo_estimate(wins: int, draws: int, losses: int) -> Dict[str, Optional[float]]:
+    """
+    Estimate the Elo difference of A over B with a 95% confidence interval.
+
+    The interval comes from the standard error of the mean game score
+    (1, 0.5 or 0) mapped through the logistic Elo curve.
+
+    Args:
+        wins (int): Games won by A.
+        draws (int): Drawn games.
+        losses (int): Games lost by A.
+
+    Returns:
+        Dict[str, Optional[float]]: "score", "elo", "elo_low" and "elo_high";
+        Elo values are None when the score is 0 or 1.
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return {"score": None, "elo": None, "elo_low": None, "elo_high": None}
+    score = (wins + 0.5 * draws) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+    margin = Z_95 * math.sqrt(variance / games)
+
+    def to_elo(s: float) -> Optional[float]:
+        if s <= 0.0 or s >= 1.0:
+            return None
+        return round(-400.0 * math.log10(1.0 / s - 1.0), 1)
+
+    return {"score": round(score, 4), "elo": to_elo(score),
+            "elo_low": to_elo(score - margin), "elo_high": to_elo(score + margin)}
+
+
+def run_match(config_a: Dict, config_b: Dict, games: int = 100, workers: Optional[int] = None,
+              seed: int = 0, max_plies: int = MAX_PLIES, record_path: Optional[str] = None) -> Dict:
+    """
+    Play a match and summarize it.
+
+    Game i uses seed + i, and A moves first in the even games. Recorded
+    games are appended as they finish, so with several workers the file
+    order can differ from the game order.
+
+    Args:
+        config_a (Dict): Configuration of player A.
+        config_b (Dict): Configuration of player B.
+        games (int, optional): Number of games. Defaults to 100.
+        workers (Optional[int], optional): Processes; 1 plays in this process. Defaults to os.cpu_count().
+        seed (int, optional): Base seed. Defaults to 0.
+        max_plies (int, optional): Move limit per game. Defaults to MAX_PLIES.
+        record_path (Optional[str], optional): Game record file to write the games to. Defaults to None.
+
+    Returns:
+        Dict: Counts, Elo estimate, mean scores and timing.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(config_a, config_b, i % 2 == 0, seed + i, max_plies) for i in range(games)]
+    played = wins = losses = total_plies = total_a = total_b = 0
+    start = time.perf_counter()
+    writer = GameRecordWriter(record_path, annotated=True) if record_path else None
+    try:
+        for a, b, plies, record in _finished_games(tasks, workers):
+            if writer is not None:
+                writer.write_game(record.moves, record.evals, record.times_ms)
+            played += 1
+            wins += a > b
+            losses += a < b
+            total_plies += plies
+            total_a += a
+            total_b += b
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - start
+
+    draws = played - wins - losses
+    return {
+        "a": config_a,
+        "b": config_b,
+        "games": played,
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        **elo_estimate(wins, draws, losses),
+        "mean_score_a": round(total_a / played, 2) if played else None,
+        "mean_score_b": round(total_b / played, 2) if played else None,
+        "mean_plies": round(total_plies / played, 1) if played else None,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "games_per_second": round(played / elapsed, 3) if elapsed else None,
+    }
+
+
+def main() -> None:
+    """Parse the command line and run a match."""
+    parser = argparse.ArgumentParser(description="Headless CPU vs CPU Oware matches (JSON output).")
+    parser.add_argument("--a", default='{"difficulty": "Hard", "max_depth": 4}', help="JSON configuration of A")
+    parser.add_argument("--b", default='{"difficulty": "Medium"}', help="JSON configuration of B")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES)
+    parser.add_argument("--record", default=None, help="binary game record file to write the games to")
+    args = parser.parse_args()
+
+    result = run_match(json.loads(args.a), json.loads(args.b), args.games, args.workers, args.seed, args.max_plies,
+                       args.record)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,6 @@ and handle JSON parsing.
 """
 
 import json
-import os
 from tkinter import messagebox, filedialog
 
 
@@ -27,6 +26,8 @@ def save_session_dialog(gui) -> None:
         "scores": list(gui.board.scores),
         "player": gui.player,
         "vs_ai": gui.vs_ai,
+        "ai_difficulty": gui.ai_difficulty,
+        "ai_time_cap_ms": gui.ai_time_cap_ms,
     }
     
     try:
@@ -85,20 +86,28 @@ def load_from_path(gui, path: str) -> None:
             pits = current.get("board_pits")
             if pits and len(pits) == gui.board.total_pits:
                 for i, v in enumerate(pits):
-                    gui.board.pits[i].stones = int(v)
+                    gui.board.set_stones(i, int(v))
             
             scores = current.get("scores")
             if scores and len(scores) == 2:
                 gui.board.scores = [int(scores[0]), int(scores[1])]
+                gui.board.rehash()
             
             gui.player = int(current.get("player", 0))
+            # Undo records only make sense on the board they were made on
+            gui.history_stack = []
+            gui.redo_stack = []
             gui.vs_ai = bool(current.get("vs_ai", False))
             
+            gui._cancel_cpu()
             if gui.vs_ai:
-                from cpu import CPUPlayer
-                gui.cpu_player = CPUPlayer(player_id=1)
+                # Files saved before the difficulty was stored use the menu selection
+                gui.ai_difficulty = str(current.get("ai_difficulty", gui.diff_var.get()))
+                gui.ai_time_cap_ms = int(current.get("ai_time_cap_ms", gui.ai_time_cap_ms))
+                gui._create_cpu_player()
             else:
                 gui.cpu_player = None
+                gui.ponderer = None
                 
             try:
                 gui.menu_frame.destroy()
@@ -4,11 +4,236 @@ sessions.py
 This manages game session persistence.
 It handles saving/loading game history, statistics (wins/losses),
 and saving/restoring interrupted game states to JSON files.
+
+Finished matches can also go to an append-only JSON Lines log
+(SessionLog): recording a match appends one line, and the cumulative
+stats come from a small summary file checkpointed every few matches plus
+the lines written after it, so the cost does not grow with the history.
+Compact a log from the Mancala folder with:
+
+    python sessions.py compact session_log.jsonl --keep 1000
 """
 
+import argparse
+import copy
 import json
 import datetime
-from typing import List, Dict, Optional
+import os
+from typing import Iterator, List, Dict, Optional, Tuple
+
+# Matches appended between two summary checkpoints
+CHECKPOINT_EVERY = 50
+# Recent matches loaded from a log into SessionManager.history
+HISTORY_TAIL = 100
+
+
+def _empty_cumulative() -> Dict:
+    """Return zeroed cumulative stats."""
+    return {"games_played": 0, "wins": {"0": 0, "1": 0}, "draws": 0}
+
+
+def _add_result(cumulative: Dict, winner: str) -> None:
+    """
+    Count one match in cumulative stats.
+
+    Args:
+        cumulative (Dict): Stats to update in place.
+        winner (str): '0', '1' or 'draw'.
+    """
+    cumulative["games_played"] += 1
+    if winner == "draw":
+        cumulative["draws"] += 1
+    else:
+        cumulative["wins"][winner] += 1
+
+
+class SessionLog:
+    """
+    An append-only JSON Lines log of match records with a checkpointed summary.
+
+    The summary file (path + '.summary.json') holds the cumulative stats of
+    the log up to a byte offset; only the lines after that offset are read
+    when the log is opened. A line cut short by a crash is skipped.
+
+    A compacted log starts with a header line holding the stats of the
+    dropped records and a generation id, so the rewritten file and its
+    stats are replaced together in one rename. A summary is only trusted
+    for the generation it was written for; otherwise the log is recounted.
+
+    Attributes:
+        path (str): The log file.
+        summary_path (str): The summary checkpoint file.
+        checkpoint_every (int): Appends between two summary writes.
+        cumulative (Dict): Stats of every match in the log, compacted ones included.
+    """
+
+    def __init__(self, path: str, checkpoint_every: int = CHECKPOINT_EVERY):
+        """
+        Open a log, reading its summary and the lines written after it.
+
+        Args:
+            path (str): Log file path (created on the first append).
+            checkpoint_every (int, optional): Appends between two summary writes. Defaults to CHECKPOINT_EVERY.
+        """
+        self.path = path
+        self.summary_path = path + ".summary.json"
+        self.checkpoint_every = checkpoint_every
+        self._generation, base = self._read_header()
+        self.cumulative, self._offset = self._read_summary(base)
+        self._pending = 0
+        for entry in self._entries_from(self._offset):
+            _add_result(self.cumulative, entry.get("winner", "draw"))
+            self._pending += 1
+        if self._pending >= checkpoint_every:
+            self._write_summary()
+
+    def _size(self) -> int:
+        """Return the size of the log file (0 if it does not exist)."""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def _read_header(self) -> Tuple[Optional[str], Dict]:
+        """Return the generation and the stats of compacted records from the first line of the log."""
+        try:
+            with open(self.path, "rb") as f:
+                header = json.loads(f.readline()).get("log_header")
+            return header["generation"], header["base"]
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None, _empty_cumulative()
+
+    def _read_summary(self, base: Dict) -> Tuple[Dict, int]:
+        """Return the checkpointed stats and the log offset they cover (base and 0 if unusable)."""
+        try:
+            with open(self.summary_path, "r", encoding="utf-8") as f:
+                summary = json.load(f)
+            offset = int(summary["offset"])
+            if summary.get("generation") == self._generation and offset <= self._size():
+                return summary["cumulative"], offset
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return copy.deepcopy(base), 0
+
+    def _write_summary(self) -> None:
+        """Checkpoint the stats of the whole log (written next to the file, then renamed)."""
+        self._offset = self._size()
+        tmp_path = self.summary_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"generation": self._generation, "offset": self._offset, "cumulative": self.cumulative}, f)
+        os.replace(tmp_path, self.summary_path)
+        self._pending = 0
+
+    def _entries_from(self, offset: int) -> Iterator[Dict]:
+        """Yield the records stored after a byte offset, skipping broken lines."""
+        if offset >= self._size():
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and "log_header" not in entry:
+                    yield entry
+
+    def append(self, entry: Dict) -> None:
+        """
+        Append one match record and count it.
+
+        Args:
+            entry (Dict): Record with at least a 'winner' key ('0', '1' or 'draw').
+        """
+        size = self._size()
+        with open(self.path, "ab") as f:
+            if size:
+                # Start on a fresh line if a previous write was cut short
+                with open(self.path, "rb") as tail:
+                    tail.seek(size - 1)
+                    if tail.read(1) != b"\n":
+                        f.write(b"\n")
+            f.write(json.dumps(entry).encode("utf-8") + b"\n")
+        _add_result(self.cumulative, entry.get("winner", "draw"))
+        self._pending += 1
+        if self._pending >= self.checkpoint_every:
+            self._write_summary()
+
+    def entries(self) -> Iterator[Dict]:
+        """
+        Stream every record of the log.
+
+        Yields:
+            Dict: Match records, oldest first.
+        """
+        return self._entries_from(0)
+
+    def tail(self, count: int) -> List[Dict]:
+        """
+        Read the last records by scanning back from the end of the file.
+
+        Args:
+            count (int): Number of records wanted.
+
+        Returns:
+            List[Dict]: Up to count records, oldest first.
+        """
+        size = self._size()
+        if not size or count <= 0:
+            return []
+        with open(self.path, "rb") as f:
+            block = 4096
+            start = size
+            data = b""
+            while start > 0 and data.count(b"\n") <= count:
+                start = max(0, start - block)
+                f.seek(start)
+                data = f.read(size - start)
+        entries = []
+        for line in data.splitlines()[-count - 1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and "log_header" not in entry:
+                entries.append(entry)
+        return entries[-count:]
+
+    def compact(self, keep: Optional[int] = None) -> int:
+        """
+        Rewrite the log without broken lines, optionally keeping only the newest records.
+
+        Dropped records stay counted in the cumulative stats through the
+        header of the new file. The file is swapped in with one rename; the
+        summary is rewritten afterwards and a crash in between only costs a
+        recount on the next open.
+
+        Args:
+            keep (Optional[int], optional): Records to keep. Defaults to None (all).
+
+        Returns:
+            int: Records left in the log.
+        """
+        tmp_path = self.path + ".tmp"
+        total = sum(1 for _ in self.entries())
+        skip = 0 if keep is None else max(0, total - keep)
+        _, base = self._read_header()
+        for i, entry in enumerate(self.entries()):
+            if i >= skip:
+                break
+            _add_result(base, entry.get("winner", "draw"))
+        generation = os.urandom(8).hex()
+        kept = 0
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"log_header": {"generation": generation, "base": base}}) + "\n")
+            for i, entry in enumerate(self.entries()):
+                if i >= skip:
+                    f.write(json.dumps(entry) + "\n")
+                    kept += 1
+        os.replace(tmp_path, self.path)
+        self._generation = generation
+        self._write_summary()
+        return kept
 
 
 class SessionManager:
@@ -19,24 +244,34 @@ class SessionManager:
         history (List[Dict]): A list of past match records.
         cumulative (Dict): Full game stats (wins, draws, games played).
         autosave_path (Optional[str]): File path for automatic saving.
+        log (Optional[SessionLog]): Append-only match log; replaces the autosave when set.
     """
 
-    def __init__(self, autosave_path: Optional[str] = None):
+    def __init__(self, autosave_path: Optional[str] = None, log_path: Optional[str] = None):
         """
         Initialize the SessionManager.
 
+        With a log, the cumulative stats and the last HISTORY_TAIL matches
+        are loaded from it and every recorded match is appended to it.
+
         Args:
             autosave_path (Optional[str], optional): Path to autosave file. Defaults to None.
+            log_path (Optional[str], optional): Path to an append-only match log. Defaults to None.
         """
         self.history: List[Dict] = []
-        self.cumulative = {"games_played": 0, "wins": {"0": 0, "1": 0}, "draws": 0}
+        self.cumulative = _empty_cumulative()
         self.autosave_path = autosave_path
+        self.log = SessionLog(log_path) if log_path else None
+        if self.log is not None:
+            self.cumulative = copy.deepcopy(self.log.cumulative)
+            self.history = self.log.tail(HISTORY_TAIL)
 
     def record_match(self, scores: List[int]) -> None:
         """
         Record the result of a finished match.
 
-        Updates history and cumulative stats, then triggers an autosave.
+        Updates history and cumulative stats, then appends the match to the
+        log, or triggers an autosave when there is no log.
 
         Args:
             scores (List[int]): Final scores [Player 0, Player 1].
@@ -55,14 +290,14 @@ class SessionManager:
             "scores": [s0, s1]
         }
         self.history.append(entry)
-        self.cumulative["games_played"] += 1
-        
-        if winner == "draw":
-            self.cumulative["draws"] += 1
-        else:
-            self.cumulative["wins"][winner] += 1
-            
-        if self.autosave_path:
+        _add_result(self.cumulative, winner)
+
+        if self.log is not None:
+            try:
+                self.log.append(entry)
+            except OSError:
+                pass
+        elif self.autosave_path:
             try:
                 self.save(self.autosave_path)
             except Exception:
@@ -111,3 +346,25 @@ class SessionManager:
             "wins_p1": self.cumulative.get("wins", {}).get("1", 0),
             "draws": self.cumulative.get("draws", 0),
         }
+
+
+def main() -> None:
+    """Parse the command line and compact or summarize a match log."""
+    parser = argparse.ArgumentParser(description="Oware session log tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compact = sub.add_parser("compact", help="rewrite a log without broken lines, optionally keeping the newest")
+    compact.add_argument("log")
+    compact.add_argument("--keep", type=int, default=None, help="number of newest matches to keep")
+    stats = sub.add_parser("stats", help="print the cumulative stats of a log")
+    stats.add_argument("log")
+    args = parser.parse_args()
+
+    log = SessionLog(args.log)
+    if args.command == "compact":
+        kept = log.compact(args.keep)
+        print(f"{kept} matches left in {args.log}")
+    print(json.dumps(log.cumulative, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+"""
+solver.py
+
+This computes the exact value of a position under perfect play.
+Solver runs MTD(f): a series of null window alpha-beta searches to the end
+of the game, each proving that the final score difference is at least or
+below a test value, until the lower and upper bounds meet. The bounds
+found by every search stay in a transposition table (ttable.py), and
+positions covered by the endgame table (tablebase.py) are looked up
+instead of searched.
+
+A solve can be limited in nodes and seconds. When a limit is hit the
+bounds proven so far are returned. With a checkpoint path the bounds and
+the transposition table are also written to disk, every few minutes and
+when the solve stops, and the next run on the same position continues
+from them.
+
+As in tablebase.py, endless play without captures is scored as if the
+game ended with each player keeping the seeds on their side: a line that
+goes max_quiet_plies plies without a capture ends there with the sweep.
+A node's value therefore depends on its position and on the plies it has
+left without a capture, and both are part of the table key, so bounds do
+not depend on the line they were found on. Once max_quiet_plies is at
+least the number of passes tablebase.py needs for a seed count, the
+values equal the tablebase's (see the verify command).
+
+Solve a position saved from the GUI (Save Match or Save Session) from the
+Mancala folder, for example:
+
+    python solver.py solve last_match.json --max-seconds 600 --checkpoint solve.ckpt
+
+and check the solver against a freshly built endgame table with:
+
+    python solver.py verify --seeds 7 --positions 300
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, NamedTuple, Optional
+from board import Board
+import state as packed
+from ttable import TranspositionTable, LOWER, UPPER, EXACT
+from zobrist import SIDE_KEY, quiet_key
+from tablebase import DEFAULT_PATH as DEFAULT_TABLEBASE, Tablebase, load_tablebase
+import tablebase as endgame
+
+# Nodes searched between two limit checks
+CHECK_INTERVAL = 1024
+# Seconds between two checkpoint writes during a solve
+CHECKPOINT_INTERVAL = 300.0
+CHECKPOINT_VERSION = 2
+# Plies without a capture after which a line is scored with the sweep
+MAX_QUIET_PLIES = 48
+
+
+class SolveLimit(Exception):
+    """Raised inside the search when the node or time limit of a solve is reached."""
+
+
+class SolveResult(NamedTuple):
+    """
+    Outcome of Solver.solve, from the point of view of the player to move.
+
+    Attributes:
+        lower (int): Proven lower bound of the final score difference (own minus opponent's).
+        upper (int): Proven upper bound of the final score difference.
+        best_move (Optional[int]): A move reaching at least lower, if one was found.
+        nodes (int): Nodes searched, previous runs of a checkpoint included.
+        elapsed_s (float): Seconds spent, previous runs of a checkpoint included.
+    """
+    lower: int
+    upper: int
+    best_move: Optional[int]
+    nodes: int
+    elapsed_s: float
+
+    @property
+    def value(self) -> Optional[int]:
+        """The exact final score difference, or None while the bounds differ."""
+        return self.lower if self.lower == self.upper else None
+
+    def to_dict(self) -> Dict:
+        """Return the result as plain JSON compatible values."""
+        return {"value": self.value, "lower": self.lower, "upper": self.upper, "best_move": self.best_move,
+                "nodes": self.nodes, "elapsed_s": round(self.elapsed_s, 3)}
+
+
+class Solver:
+    """
+    Exact MTD(f) solver over packed states.
+
+    Attributes:
+        tt (TranspositionTable): Bounds proven so far (kept between solves of related positions).
+        tablebase (Optional[Tablebase]): Endgame table probed by the search, if one is available.
+        checkpoint_path (Optional[str]): JSON checkpoint file; the table goes to checkpoint_path + '.tt'.
+        checkpoint_interval_s (float): Seconds between checkpoint writes during a solve.
+        max_quiet_plies (int): Plies without a capture after which a line is scored with the sweep.
+        nodes (int): Nodes searched by the current or last solve.
+    """
+
+    def __init__(self, tt_size_mb: float = 64, tablebase_path: Optional[str] = None,
+                 checkpoint_path: Optional[str] = None, checkpoint_interval_s: float = CHECKPOINT_INTERVAL,
+                 max_quiet_plies: int = MAX_QUIET_PLIES):
+        """
+        Initialize the solver.
+
+        Args:
+            tt_size_mb (float, optional): Transposition table memory budget in megabytes. Defaults to 64.
+            tablebase_path (Optional[str], optional): Endgame table file. Defaults to endgame.tb next to
+                this module when it exists.
+            checkpoint_path (Optional[str], optional): Checkpoint to resume from and write to. Defaults to None.
+            checkpoint_interval_s (float, optional): Seconds between checkpoint writes. Defaults to
+                CHECKPOINT_INTERVAL.
+            max_quiet_plies (int, optional): Plies without a capture before the sweep is scored. Defaults to
+                MAX_QUIET_PLIES.
+        """
+        self.tt = TranspositionTable(tt_size_mb)
+        if tablebase_path is None and os.path.exists(DEFAULT_TABLEBASE):
+            tablebase_path = DEFAULT_TABLEBASE
+        self.tablebase: Optional[Tablebase] = load_tablebase(tablebase_path) if tablebase_path else None
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval_s = checkpoint_interval_s
+        self.max_quiet_plies = max_quiet_plies
+        self.nodes = 0
+
+    def solve(self, board: Board, player: int, max_nodes: Optional[int] = None,
+              max_seconds: Optional[float] = None) -> SolveResult:
+        """
+        Solve a board position.
+
+        Args:
+            board (Board): The position.
+            player (int): Player to move.
+            max_nodes (Optional[int], optional): Node limit of this run (checked every CHECK_INTERVAL nodes).
+            max_seconds (Optional[float], optional): Time limit of this run.
+
+        Returns:
+            SolveResult: The bounds proven; value is set when they meet.
+        """
+        return self.solve_state(packed.pack(board), player, board.pits_per_side, max_nodes, max_seconds)
+
+    def solve_state(self, state: int, player: int, pits_per_side: int = 6, max_nodes: Optional[int] = None,
+                    max_seconds: Optional[float] = None) -> SolveResult:
+        """
+        Solve a packed position, resuming from the checkpoint when it holds the same position.
+
+        Args:
+            state (int): The packed position.
+            player (int): Player to move.
+            pits_per_side (int, optional): Pits per player. Defaults to 6.
+            max_nodes (Optional[int], optional): Node limit of this run (checked every CHECK_INTERVAL nodes).
+            max_seconds (Optional[float], optional): Time limit of this run.
+
+        Returns:
+            SolveResult: The bounds proven; value is set when they meet.
+
+        Raises:
+            ValueError: If the checkpoint belongs to another position.
+            RuntimeError: If the proven bounds cross (an inconsistent table or checkpoint).
+        """
+        pps = pits_per_side
+        self._pits_per_side = pps
+        self._side_masks = (packed.side_mask(0, pps), packed.side_mask(1, pps))
+        on_board = packed.side_total(state, 0, pps) + packed.side_total(state, 1, pps)
+        self._total_seeds = on_board + packed.score(state, 0, pps) + packed.score(state, 1, pps)
+        diff = packed.score(state, player, pps) - packed.score(state, 1 - player, pps)
+
+        self._root = {"state": state, "player": player, "pits_per_side": pps,
+                      "max_quiet_plies": self.max_quiet_plies}
+        self.lower, self.upper = diff - on_board, diff + on_board
+        self.best_move: Optional[int] = None
+        guess = diff
+        previous_nodes, previous_s = 0, 0.0
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            saved = self._load_checkpoint()
+            guess = saved["guess"]
+            previous_nodes, previous_s = saved["nodes"], saved["elapsed_s"]
+
+        # Every capture takes at least 2 seeds and resets the quiet counter, which bounds the line length
+        depth_bound = (on_board // 2 + 1) * (self.max_quiet_plies + 1) + 100
+        if sys.getrecursionlimit() < depth_bound:
+            sys.setrecursionlimit(depth_bound)
+        self.nodes = 0
+        self._quiet_keys = [quiet_key(q) for q in range(self.max_quiet_plies + 1)]
+        self._root_move: Optional[int] = None
+        start = time.perf_counter()
+        self._node_limit = max_nodes
+        self._deadline = None if max_seconds is None else start + max_seconds
+        self._next_checkpoint = start + self.checkpoint_interval_s
+        self._previous = (previous_nodes, previous_s, start)
+        key = packed.hash_key(state, pps)
+        try:
+            while self.lower < self.upper:
+                guess = min(max(guess, self.lower), self.upper)
+                gamma = guess + 1 if guess == self.lower else guess
+                value = self._search(state, player, key, gamma, 0, self.max_quiet_plies)
+                if value >= gamma:
+                    self.lower = value
+                    self.best_move = self._root_move
+                else:
+                    self.upper = value
+                if self.lower > self.upper:
+                    raise RuntimeError(f"Solver bounds crossed (lower {self.lower} > upper {self.upper}).")
+                guess = value
+        except SolveLimit:
+            pass
+        if self.best_move is None:
+            entry = self.tt.probe(key ^ (SIDE_KEY if player else 0) ^ self._quiet_keys[self.max_quiet_plies])
+            self.best_move = entry[3] if entry is not None else None
+        if self.checkpoint_path:
+            self._save_checkpoint(guess)
+        return SolveResult(self.lower, self.upper, self.best_move, previous_nodes + self.nodes,
+                           previous_s + time.perf_counter() - start)
+
+    def _check_limits(self) -> None:
+        """Stop at the node or time limit and write the periodic checkpoint."""
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SolveLimit()
+        now = time.perf_counter()
+        if self._deadline is not None and now >= self._deadline:
+            raise SolveLimit()
+        if self.checkpoint_path and now >= self._next_checkpoint:
+            # Entries in the table are proven bounds at any moment, so a mid search checkpoint is valid
+            self._save_checkpoint(None)
+            self._next_checkpoint = now + self.checkpoint_interval_s
+
+    def _sweep_value(self, state: int, player: int) -> int:
+        """Return the final difference if each player now keeps the seeds on their side."""
+        pps = self._pits_per_side
+        return (packed.score(state, player, pps) - packed.score(state, 1 - player, pps)
+                + packed.side_total(state, player, pps) - packed.side_total(state, 1 - player, pps))
+
+    def _search(self, state: int, player: int, key: int, gamma: int, ply: int, quiet_left: int) -> int:
+        """
+        Null window alpha-beta search to the end of the game.
+
+        Fail soft: a value of at least gamma is a lower bound of the exact
+        value, a value below gamma an upper bound. Both are stored in the
+        transposition table under the position and quiet_left, with the
+        number of seeds on the board as depth, so the depth-preferred slot
+        keeps the positions with the largest subtrees. The root is always
+        expanded so its best move is known.
+
+        Args:
+            state (int): The packed state.
+            player (int): Player to move.
+            key (int): Zobrist hash of state (side to move not included).
+            gamma (int): The test value.
+            ply (int): Distance from the root.
+            quiet_left (int): Plies still allowed without a capture.
+
+        Returns:
+            int: Bound on the final score difference for the player to move.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self._check_limits()
+
+        pps = self._pits_per_side
+        if not state & self._side_masks[player] or not state & self._side_masks[1 - player]:
+            return self._sweep_value(state, player)
+        own = packed.score(state, player, pps)
+        other = packed.score(state, 1 - player, pps)
+        on_board = self._total_seeds - own - other
+        tablebase = self.tablebase
+        if (ply > 0 and tablebase is not None and tablebase.pits_per_side == pps
+                and on_board <= tablebase.max_seeds):
+            value = tablebase.probe(state, player)
+            if value is not None:
+                return own - other + value
+
+        if quiet_left <= 0:
+            return self._sweep_value(state, player)
+        tt_key = key ^ (SIDE_KEY if player else 0) ^ self._quiet_keys[quiet_left]
+        entry = self.tt.probe(tt_key)
+        tt_move = None
+        if entry is not None:
+            _, flag, value, tt_move = entry
+            if ply > 0 and (flag == EXACT or (flag == LOWER and value >= gamma)
+                            or (flag == UPPER and value < gamma)):
+                return value
+
+        legal = packed.children(state, player, pps)
+        legal.sort(key=lambda child: (child[0] == tt_move, child[2]), reverse=True)
+        opp = 1 - player
+        best = -self._total_seeds - 1
+        best_move = None
+        for move, child, captured in legal:
+            value = -self._search(child, opp, packed.update_key(key, state, child, pps), 1 - gamma, ply + 1,
+                                  self.max_quiet_plies if captured else quiet_left - 1)
+            if value > best:
+                best = value
+                best_move = move
+                if value >= gamma:
+                    break
+
+        self.tt.store(tt_key, on_board, LOWER if best >= gamma else UPPER, best, best_move)
+        if ply == 0:
+            self._root_move = best_move
+        return best
+
+    def _save_checkpoint(self, guess: Optional[int]) -> None:
+        """
+        Write the root bounds and the transposition table.
+
+        Args:
+            guess (Optional[int]): Next MTD(f) test value; None keeps the middle of the bounds.
+        """
+        previous_nodes, previous_s, start = self._previous
+        payload = dict(self._root)
+        payload.update({
+            "version": CHECKPOINT_VERSION,
+            "lower": self.lower,
+            "upper": self.upper,
+            "guess": (self.lower + self.upper) // 2 if guess is None else guess,
+            "best_move": self.best_move,
+            "nodes": previous_nodes + self.nodes,
+            "elapsed_s": previous_s + time.perf_counter() - start,
+        })
+        self.tt.save(self.checkpoint_path + ".tt")
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _load_checkpoint(self) -> Dict:
+        """
+        Read the checkpoint of the position being solved into the solver.
+
+        Returns:
+            Dict: The checkpoint payload.
+
+        Raises:
+            ValueError: If the checkpoint belongs to another position or version.
+        """
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{self.checkpoint_path} is not a version {CHECKPOINT_VERSION} solver checkpoint.")
+        if any(saved.get(name) != value for name, value in self._root.items()):
+            raise ValueError(f"{self.checkpoint_path} belongs to another position.")
+        self.lower = max(self.lower, saved["lower"])
+        self.upper = min(self.upper, saved["upper"])
+        if self.lower > self.upper:
+            raise ValueError(f"{self.checkpoint_path} holds crossed bounds.")
+        self.best_move = saved.get("best_move")
+        tt_path = self.checkpoint_path + ".tt"
+        if os.path.exists(tt_path):
+            self.tt.load(tt_path)
+        return saved
+
+
+def load_position(path: str) -> Dict:
+    """
+    Read a position saved by the GUI (Save Match, or the current game of Save Session).
+
+    Args:
+        path (str): Path of the JSON file.
+
+    Returns:
+        Dict: 'board' (Board) and 'player' (int).
+
+    Raises:
+        ValueError: If the file holds no board position.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data = data.get("current", data)
+    pits = data.get("board_pits")
+    if not pits:
+        raise ValueError(f"{path} holds no board position.")
+    board = Board(len(pits) // 2)
+    for i, count in enumerate(pits):
+        board.pits[i].stones = int(count)
+    board.scores = [int(s) for s in data.get("scores", [0, 0])]
+    board.rehash()
+    return {"board": board, "player": int(data.get("player", 0))}
+
+
+def verify(max_seeds: int = 7, positions: int = 300, seed: int = 0, tt_size_mb: float = 4,
+           max_quiet_plies: int = MAX_QUIET_PLIES) -> Dict:
+    """
+    Solve random small positions without an endgame table and compare them with a freshly solved one.
+
+    Args:
+        max_seeds (int, optional): Largest number of seeds on the board. Defaults to 7.
+        positions (int, optional): Positions to check. Defaults to 300.
+        seed (int, optional): Seed of the position sample. Defaults to 0.
+        tt_size_mb (float, optional): Table size of every solve. Defaults to 4.
+        max_quiet_plies (int, optional): Solver setting to check. Defaults to MAX_QUIET_PLIES.
+
+    Returns:
+        Dict: Counts, the mismatching positions and timing.
+    """
+    values = endgame.solve(max_seeds)
+    sample = [pits for seeds in range(1, max_seeds + 1) for pits in endgame.distributions(seeds, 12)]
+    rng = random.Random(seed)
+    sample = rng.sample(sample, min(positions, len(sample)))
+    mismatches = []
+    start = time.perf_counter()
+    for pits in sample:
+        solver = Solver(tt_size_mb, tablebase_path="", max_quiet_plies=max_quiet_plies)
+        result = solver.solve_state(endgame._pack_pits(pits), 0, 6)
+        expected = values[endgame.position_index(pits)]
+        if result.value != expected:
+            mismatches.append({"pits": list(pits), "solver": result.value, "tablebase": expected})
+    return {"max_seeds": max_seeds, "positions": len(sample), "max_quiet_plies": max_quiet_plies,
+            "mismatches": mismatches, "seconds": round(time.perf_counter() - start, 3)}
+
+
+def main() -> None:
+    """Parse the command line and solve a saved position or verify the solver."""
+    parser = argparse.ArgumentParser(description="Exact Oware solver (JSON output).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    solve = sub.add_parser("solve", help="solve a position saved by the GUI")
+    solve.add_argument("position", help="JSON file saved by the GUI (match or session)")
+    solve.add_argument("--player", type=int, default=None, help="player to move (default: from the file)")
+    solve.add_argument("--max-nodes", type=int, default=None)
+    solve.add_argument("--max-seconds", type=float, default=None)
+    solve.add_argument("--checkpoint", default=None, help="checkpoint file to resume from and write to")
+    solve.add_argument("--tt-mb", type=float, default=64)
+    solve.add_argument("--tablebase", default=None)
+    solve.add_argument("--max-quiet-plies", type=int, default=MAX_QUIET_PLIES)
+    check = sub.add_parser("verify", help="compare solves of random small positions with a fresh endgame table")
+    check.add_argument("--seeds", type=int, default=7, help="largest number of seeds on the board")
+    check.add_argument("--positions", type=int, default=300)
+    check.add_argument("--seed", type=int, default=0)
+    check.add_argument("--max-quiet-plies", type=int, default=MAX_QUIET_PLIES)
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        report = verify(args.seeds, args.positions, args.seed, max_quiet_plies=args.max_quiet_plies)
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report["mismatches"] else 0)
+
+    position = load_position(args.position)
+    player = position["player"] if args.player is None else args.player
+    solver = Solver(args.tt_mb, args.tablebase, args.checkpoint, max_quiet_plies=args.max_quiet_plies)
+    result = solver.solve(position["board"], player, args.max_nodes, args.max_seconds)
+    print(json.dumps({"player": player, **result.to_dict()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+"""
+state.py
+
+This defines a compact, immutable representation of an Oware position.
+Every pit count and both scores are packed into one integer (one byte per
+field), so the search can generate, apply and undo moves without creating
+Pit or Board objects for every node it visits.
+
+Layout (least significant byte first):
+    pit 0, pit 1, ..., pit (total_pits - 1), score of Player 0, score of Player 1
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from board import Board, sow_table
+from zobrist import zobrist_keys
+
+FIELD_BITS = 8
+FIELD_MASK = (1 << FIELD_BITS) - 1
+
+
+@lru_cache(maxsize=None)
+def side_mask(player: int, pits_per_side: int = 6) -> int:
+    """
+    Return a bit mask covering every pit field of one player.
+
+    Args:
+        player (int): The player ID (0 or 1).
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        int: Mask that is non zero on the player's pit fields only.
+    """
+    mask = (1 << (FIELD_BITS * pits_per_side)) - 1
+    return mask << (FIELD_BITS * pits_per_side * player)
+
+
+def pack(board: Board) -> int:
+    """
+    Convert a Board into its packed integer form.
+
+    Args:
+        board (Board): The board to convert.
+
+    Returns:
+        int: The packed state.
+
+    Raises:
+        ValueError: If a pit or score does not fit into a single byte field.
+    """
+    fields = [p.stones for p in board.pits] + list(board.scores)
+    if sum(fields) > FIELD_MASK or min(fields) < 0:
+        raise ValueError("Board holds more seeds than a packed state can represent.")
+    state = 0
+    for i, value in enumerate(fields):
+        state |= value << (FIELD_BITS * i)
+    return state
+
+
+def unpack(state: int, pits_per_side: int = 6, initial_stones: int = 4) -> Board:
+    """
+    Rebuild a Board from a packed state.
+
+    Args:
+        state (int): The packed state.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+        initial_stones (int, optional): Starting stones per pit of the variant. Defaults to 4.
+
+    Returns:
+        Board: A new Board with the same pits and scores.
+    """
+    board = Board(pits_per_side, initial_stones)
+    for i in range(board.total_pits):
+        board.pits[i].stones = stones(state, i)
+    board.scores = [score(state, 0, pits_per_side), score(state, 1, pits_per_side)]
+    board.rehash()
+    return board
+
+
+def stones(state: int, pit_index: int) -> int:
+    """
+    Read the seed count of one pit.
+
+    Args:
+        state (int): The packed state.
+        pit_index (int): The index of the pit.
+
+    Returns:
+        int: Seeds in that pit.
+    """
+    return (state >> (FIELD_BITS * pit_index)) & FIELD_MASK
+
+
+def score(state: int, player: int, pits_per_side: int = 6) -> int:
+    """
+    Read the score of a player.
+
+    Args:
+        state (int): The packed state.
+        player (int): The player ID (0 or 1).
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        int: Seeds captured by that player.
+    """
+    return (state >> (FIELD_BITS * (2 * pits_per_side + player))) & FIELD_MASK
+
+
+def side_total(state: int, player: int, pits_per_side: int = 6) -> int:
+    """
+    Sum the seeds currently on one player's side.
+
+    Args:
+        state (int): The packed state.
+        player (int): The player ID (0 or 1).
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        int: Total seeds on that side.
+    """
+    start = pits_per_side * player
+    return sum(stones(state, i) for i in range(start, start + pits_per_side))
+
+
+@lru_cache(maxsize=None)
+def sow_deltas(pits_per_side: int = 6) -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    Return the sowing table of board.sow_table in packed form.
+
+    deltas[pit][seeds] already includes emptying the origin pit, so sowing a
+    packed state is one integer addition. The result is cached per geometry.
+
+    Args:
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        Tuple[List[List[int]], List[List[int]]]: (Packed deltas, last pit indices), indexed [pit][seeds].
+    """
+    table = sow_table(2 * pits_per_side)
+    deltas = []
+    for pit in range(table.total_pits):
+        row = []
+        for seeds in range(min(table.max_seeds, FIELD_MASK) + 1):
+            packed_delta = -(seeds << (FIELD_BITS * pit))
+            for i, gain in enumerate(table.deltas[pit][seeds]):
+                packed_delta += gain << (FIELD_BITS * i)
+            row.append(packed_delta)
+        deltas.append(row)
+    return deltas, table.last
+
+
+def _sow(state: int, pit_index: int, pits_per_side: int) -> Tuple[int, int]:
+    """
+    Sow the seeds of one pit on a packed state.
+
+    Args:
+        state (int): The packed state.
+        pit_index (int): The pit to sow from.
+        pits_per_side (int): Pits per player.
+
+    Returns:
+        Tuple[int, int]: (State after sowing, index of the last pit sown into).
+    """
+    seeds = stones(state, pit_index)
+    deltas, last = sow_deltas(pits_per_side)
+    return state + deltas[pit_index][seeds], last[pit_index][seeds]
+
+
+def hash_key(state: int, pits_per_side: int = 6) -> int:
+    """
+    Compute the Zobrist hash of a packed state from scratch.
+
+    Matches Board.hash_key of the unpacked board.
+
+    Args:
+        state (int): The packed state.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        int: The 64-bit hash (side to move not included).
+    """
+    total_pits = 2 * pits_per_side
+    pits = [stones(state, i) for i in range(total_pits)]
+    scores = [score(state, 0, pits_per_side), score(state, 1, pits_per_side)]
+    return zobrist_keys(total_pits).full_key(pits, scores)
+
+
+def update_key(key: int, parent: int, child: int, pits_per_side: int = 6) -> int:
+    """
+    Derive the hash of a child state from its parent's hash.
+
+    Only the fields that differ between the two states are visited.
+
+    Args:
+        key (int): Hash of the parent state.
+        parent (int): The packed parent state.
+        child (int): The packed child state.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        int: Hash of the child state.
+    """
+    total_pits = 2 * pits_per_side
+    keys = zobrist_keys(total_pits)
+    diff = parent ^ child
+    while diff:
+        field = ((diff & -diff).bit_length() - 1) // FIELD_BITS
+        shift = FIELD_BITS * field
+        old = (parent >> shift) & FIELD_MASK
+        new = (child >> shift) & FIELD_MASK
+        if field < total_pits:
+            key ^= keys.pits[field][old] ^ keys.pits[field][new]
+        else:
+            player = field - total_pits
+            key ^= keys.scores[player][old] ^ keys.scores[player][new]
+        diff &= ~(FIELD_MASK << shift)
+    return key
+
+
+def _capture(state: int, last_idx: int, mover: int, pits_per_side: int) -> Tuple[int, int]:
+    """
+    Apply the capture phase on a packed state and credit the mover.
+
+    Args:
+        state (int): The packed state after sowing.
+        last_idx (int): Index where the last seed landed.
+        mover (int): Player who made the move.
+        pits_per_side (int): Pits per player.
+
+    Returns:
+        Tuple[int, int]: (State after capturing, seeds captured).
+    """
+    low = pits_per_side * (1 - mover)
+    if not low <= last_idx < low + pits_per_side:
+        return state, 0
+    captured = 0
+    i = last_idx
+    while i >= low:
+        here = stones(state, i)
+        if here not in (2, 3):
+            break
+        captured += here
+        state -= here << (FIELD_BITS * i)
+        i -= 1
+    if captured:
+        state += captured << (FIELD_BITS * (2 * pits_per_side + mover))
+    return state, captured
+
+
+def _play(state: int, player: int, pit_index: int, pits_per_side: int) -> int:
+    """Sow and capture without any legality check (internal helper)."""
+    state, last_idx = _sow(state, pit_index, pits_per_side)
+    state, _ = _capture(state, last_idx, player, pits_per_side)
+    return state
+
+
+def children(state: int, player: int, pits_per_side: int = 6) -> List[Tuple[int, int, int]]:
+    """
+    Produce every legal child of a packed state, sowing each pit exactly once.
+
+    Applies the same Grand Slam rule as rules.generate_moves.
+
+    Args:
+        state (int): The packed state.
+        player (int): The player ID (0 or 1).
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        List[Tuple[int, int, int]]: (pit index, child state, seeds captured) per legal move.
+    """
+    deltas, last = sow_deltas(pits_per_side)
+    opp_mask = side_mask(1 - player, pits_per_side)
+    start = pits_per_side * player
+    results = []
+    legal = []
+    for pit in range(start, start + pits_per_side):
+        seeds = (state >> (FIELD_BITS * pit)) & FIELD_MASK
+        if not seeds:
+            continue
+        child, captured = _capture(state + deltas[pit][seeds], last[pit][seeds], player, pits_per_side)
+        results.append((pit, child, captured))
+        if child & opp_mask:
+            legal.append((pit, child, captured))
+    return legal if legal else results
+
+
+def random_child(state: int, player: int, pits_per_side: int, rng) -> Optional[int]:
+    """
+    Play a uniformly random legal move (random playouts).
+
+    A random non empty pit is drawn and dropped again if its move leaves
+    the opponent without seeds, so usually only one pit is sown. Applies
+    the same Grand Slam rule as children.
+
+    Args:
+        state (int): The packed state.
+        player (int): The player ID (0 or 1).
+        pits_per_side (int): Pits per player.
+        rng (random.Random): Random source.
+
+    Returns:
+        Optional[int]: The child state, or None if the player has no seeds.
+    """
+    deltas, last = sow_deltas(pits_per_side)
+    opp_mask = side_mask(1 - player, pits_per_side)
+    start = pits_per_side * player
+    pits = [pit for pit in range(start, start + pits_per_side) if (state >> (FIELD_BITS * pit)) & FIELD_MASK]
+    fallback = None
+    while pits:
+        i = int(rng.random() * len(pits))
+        pit = pits[i]
+        seeds = (state >> (FIELD_BITS * pit)) & FIELD_MASK
+        child, _ = _capture(state + deltas[pit][seeds], last[pit][seeds], player, pits_per_side)
+        if child & opp_mask:
+            return child
+        if fallback is None:
+            fallback = child
+        pits[i] = pits[-1]
+        pits.pop()
+    return fallback
+
+
+def legal_moves(state: int, player: int, pits_per_side: int = 6) -> List[int]:
+    """
+    Determine all legal moves for a player on a packed state.
+
+    Applies the same Grand Slam rule as rules.legal_moves.
+
+    Args:
+        state (int): The packed state.
+        player (int): The player ID (0 or 1).
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        List[int]: A list of legal pit indices.
+    """
+    return [pit for pit, _, _ in children(state, player, pits_per_side)]
+
+
+def make_move(state: int, player: int, pit_index: int, pits_per_side: int = 6) -> Tuple[int, int]:
+    """
+    Play a move on a packed state without validating it.
+
+    The caller is expected to pick pit_index from legal_moves.
+
+    Args:
+        state (int): The packed state.
+        player (int): The player ID.
+        pit_index (int): The index of the pit selected.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        Tuple[int, int]: (Child state, undo token for unmake_move).
+    """
+    child = _play(state, player, pit_index, pits_per_side)
+    return child, child - state
+
+
+def unmake_move(state: int, undo: int) -> int:
+    """
+    Revert a move played with make_move.
+
+    Args:
+        state (int): The packed state after the move.
+        undo (int): The undo token returned by make_move.
+
+    Returns:
+        int: The packed state before the move.
+    """
+    return state - undo
+
+
+def apply_move(state: int, player: int, pit_index: int, pits_per_side: int = 6) -> Optional[int]:
+    """
+    Validate and play a move on a packed state.
+
+    Args:
+        state (int): The packed state.
+        player (int): The player ID.
+        pit_index (int): The index of the pit selected.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        Optional[int]: The child state, or None if the move is illegal.
+    """
+    for pit, child, _ in children(state, player, pits_per_side):
+        if pit == pit_index:
+            return child
+    return None
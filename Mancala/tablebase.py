@@ -0,0 +1,326 @@
+"""
+tablebase.py
+
+This builds and reads the endgame database used by the CPU search.
+Every position with at most max_seeds seeds left on the board is solved
+exactly by retrograde analysis over the board.py/rules.py semantics, and the
+results are written as one signed byte per position, at the offset given by
+a combinatorial (stars and bars) ranking of the seed distribution.
+
+Positions are stored from the point of view of the player to move, with the
+board rotated so that player's pits come first. The stored value is the best
+difference (own future gains minus opponent's future gains) the player to
+move can force, counting captures and the final sweep of game.py.
+Play that cycles without captures is scored as if the game ended with each
+player keeping the seeds on their own side.
+
+Build from the Mancala folder, for example:
+
+    python tablebase.py build --seeds 8 --out endgame.tb
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from array import array
+from functools import lru_cache
+from itertools import combinations
+from typing import Callable, Iterator, List, Optional, Tuple
+import state as packed
+
+MAGIC = b"OWTB"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBx")
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "endgame.tb")
+
+
+def distributions(seeds: int, total_pits: int) -> Iterator[Tuple[int, ...]]:
+    """
+    Enumerate every way to spread seeds over total_pits pits (stars and bars).
+
+    Args:
+        seeds (int): Number of seeds.
+        total_pits (int): Number of pits.
+
+    Yields:
+        Tuple[int, ...]: Seed count per pit.
+    """
+    slots = seeds + total_pits - 1
+    for bars in combinations(range(slots), total_pits - 1):
+        prev = -1
+        counts = []
+        for bar in bars:
+            counts.append(bar - prev - 1)
+            prev = bar
+        counts.append(slots - prev - 1)
+        yield tuple(counts)
+
+
+@lru_cache(maxsize=None)
+def binomials(n_max: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Return Pascal's triangle up to n_max as nested tuples, table[n][r] = C(n, r).
+
+    Args:
+        n_max (int): Largest n needed.
+
+    Returns:
+        Tuple[Tuple[int, ...], ...]: The table (zero where r > n).
+    """
+    rows = [[1] + [0] * n_max]
+    for n in range(1, n_max + 1):
+        prev = rows[-1]
+        rows.append([1] + [prev[r - 1] + prev[r] for r in range(1, n_max + 1)])
+    return tuple(tuple(row) for row in rows)
+
+
+def table_size(max_seeds: int, total_pits: int) -> int:
+    """
+    Count the positions with at most max_seeds seeds on total_pits pits.
+
+    Args:
+        max_seeds (int): Largest number of seeds.
+        total_pits (int): Number of pits.
+
+    Returns:
+        int: C(max_seeds + total_pits, total_pits).
+    """
+    return binomials(max_seeds + total_pits)[max_seeds + total_pits][total_pits]
+
+
+def position_index(pits: Tuple[int, ...]) -> int:
+    """
+    Rank a seed distribution among all table positions (stars and bars).
+
+    Positions with k seeds start at C(k + P - 1, P), the number of positions
+    with fewer seeds. Inside a level, the bar positions b_j = (seeds in pits
+    0..j) + j form a combination ranked in colexicographic order as the sum
+    of C(b_j, j + 1). The cost is O(pits).
+
+    Args:
+        pits (Tuple[int, ...]): Seed counts, player to move first.
+
+    Returns:
+        int: Offset of the position in the value array.
+    """
+    total_pits = len(pits)
+    binom = binomials(sum(pits) + total_pits)
+    seeds = 0
+    rank = 0
+    for j in range(total_pits - 1):
+        seeds += pits[j]
+        rank += binom[seeds + j][j + 1]
+    seeds += pits[-1]
+    return binom[seeds + total_pits - 1][total_pits] + rank
+
+
+def _pack_pits(pits: Tuple[int, ...]) -> int:
+    """Pack pit counts (scores zero) into a state.py integer."""
+    state = 0
+    for i, count in enumerate(pits):
+        state |= count << (packed.FIELD_BITS * i)
+    return state
+
+
+def _rotated(state: int, pits_per_side: int) -> Tuple[int, ...]:
+    """Return the pits of a packed state seen from Player 1."""
+    total_pits = 2 * pits_per_side
+    return tuple(packed.stones(state, (i + pits_per_side) % total_pits) for i in range(total_pits))
+
+
+def solve(max_seeds: int, pits_per_side: int = 6, max_passes: int = 500,
+          progress: Optional[Callable[[str], None]] = None) -> array:
+    """
+    Solve every position with at most max_seeds seeds on the board.
+
+    Levels are solved from 0 seeds upwards. A capture always leads to an
+    already solved lower level; moves without a capture stay on the same
+    level and are resolved by iterating until no value changes.
+
+    Args:
+        max_seeds (int): Largest number of seeds on the board.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+        max_passes (int, optional): Iteration cap per level. Defaults to 500.
+        progress (Optional[Callable[[str], None]], optional): Receives one line per solved level.
+
+    Returns:
+        array: Signed byte values indexed by position_index.
+
+    Raises:
+        ValueError: If max_seeds does not fit the signed byte values.
+        RuntimeError: If a level still changes after max_passes passes.
+    """
+    if max_seeds > 127:
+        raise ValueError("Values are stored as signed bytes; at most 127 seeds are supported.")
+    total_pits = 2 * pits_per_side
+    values = array('b', bytes(table_size(max_seeds, total_pits)))
+
+    for level in range(max_seeds + 1):
+        started = time.perf_counter()
+        count = 0
+        open_nodes: List[Tuple[int, int, List[int]]] = []
+
+        for pits in distributions(level, total_pits):
+            count += 1
+            i = position_index(pits)
+            own, other = sum(pits[:pits_per_side]), sum(pits[pits_per_side:])
+            # The game is over: each player sweeps their own side
+            values[i] = own - other
+            if own == 0 or other == 0:
+                continue
+            lower_best = -packed.FIELD_MASK
+            same_level = []
+            for _, child, captured in packed.children(_pack_pits(pits), 0, pits_per_side):
+                child_index = position_index(_rotated(child, pits_per_side))
+                if captured:
+                    lower_best = max(lower_best, captured - values[child_index])
+                else:
+                    same_level.append(child_index)
+            open_nodes.append((i, lower_best, same_level))
+
+        passes = 0
+        changed = True
+        while changed and passes < max_passes:
+            changed = False
+            passes += 1
+            for i, lower_best, same_level in open_nodes:
+                best = lower_best
+                for j in same_level:
+                    if -values[j] > best:
+                        best = -values[j]
+                if best != values[i]:
+                    values[i] = best
+                    changed = True
+
+        if changed:
+            raise RuntimeError(f"Level {level} did not converge in {max_passes} passes; "
+                               f"raise max_passes.")
+        if progress is not None:
+            progress(f"level {level}: {count} positions, {passes} passes, "
+                     f"{time.perf_counter() - started:.1f}s")
+    return values
+
+
+def write_table(path: str, values: array, max_seeds: int, pits_per_side: int = 6) -> None:
+    """
+    Write solved values as a header followed by one signed byte per position.
+
+    Args:
+        path (str): Target file path.
+        values (array): Output of solve.
+        max_seeds (int): Largest number of seeds covered.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+    """
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, pits_per_side, max_seeds))
+        values.tofile(f)
+
+
+class Tablebase:
+    """
+    A read-only, memory-mapped endgame table.
+
+    The file is mapped rather than read, so lookups copy nothing and every
+    process on a host that opens the same file shares one copy in the page cache.
+
+    Attributes:
+        path (str): File the table is mapped from.
+        pits_per_side (int): Pits per player of the solved variant.
+        max_seeds (int): Largest number of seeds on the board covered.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a table written by write_table.
+
+        Args:
+            path (str): Path of the .tb file.
+
+        Raises:
+            ValueError: If the file is not a tablebase of this version or is truncated.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is not a version {VERSION} Oware tablebase; rebuild it.")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, pits_per_side, max_seeds = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} Oware tablebase; rebuild it.")
+        self.pits_per_side = pits_per_side
+        self.max_seeds = max_seeds
+        self._total_pits = 2 * pits_per_side
+        self._binom = binomials(max_seeds + self._total_pits)
+        self._values = memoryview(self._map)[HEADER.size:].cast('b')
+        if len(self._values) != table_size(max_seeds, self._total_pits):
+            self.close()
+            raise ValueError(f"{path} is truncated.")
+
+    def probe(self, state: int, player: int) -> Optional[int]:
+        """
+        Look up the exact value of a packed state.
+
+        Args:
+            state (int): The packed state.
+            player (int): Player to move.
+
+        Returns:
+            Optional[int]: Future gain difference for the player to move, or None if not covered.
+        """
+        total_pits = self._total_pits
+        offset = self.pits_per_side * player
+        binom = self._binom
+        limit = self.max_seeds
+        seeds = 0
+        rank = 0
+        for j in range(total_pits - 1):
+            seeds += (state >> (packed.FIELD_BITS * ((j + offset) % total_pits))) & packed.FIELD_MASK
+            if seeds > limit:
+                return None
+            rank += binom[seeds + j][j + 1]
+        seeds += (state >> (packed.FIELD_BITS * ((offset - 1) % total_pits))) & packed.FIELD_MASK
+        if seeds > limit:
+            return None
+        return self._values[binom[seeds + total_pits - 1][total_pits] + rank]
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._values.release()
+        self._map.close()
+
+
+@lru_cache(maxsize=None)
+def load_tablebase(path: str) -> Tablebase:
+    """
+    Map a tablebase once per process and share it.
+
+    Args:
+        path (str): Path of the .tb file.
+
+    Returns:
+        Tablebase: The mapped table.
+    """
+    return Tablebase(path)
+
+
+def main() -> None:
+    """Parse the command line and build a table."""
+    parser = argparse.ArgumentParser(description="Oware endgame tablebase tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="solve all positions with few seeds and write a .tb file")
+    build.add_argument("--seeds", type=int, default=8, help="largest number of seeds on the board")
+    build.add_argument("--out", default=DEFAULT_PATH)
+    build.add_argument("--max-passes", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        values = solve(args.seeds, max_passes=args.max_passes, progress=print)
+        write_table(args.out, values, args.seeds)
+        print(f"wrote {len(values)} positions to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
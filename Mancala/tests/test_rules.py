@@ -0,0 +1,183 @@
+"""
+test_rules.py
+
+This checks that the three rules engines agree: rules.py on Board
+objects, state.py on packed integers and batch_rules.py on NumPy arrays
+(skipped when NumPy is not installed). It also checks make/unmake undo
+records and tokens, sowing of whole laps and perft counts at fixed depth.
+Run it from the Mancala folder:
+
+    python -m unittest discover tests
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board
+import bench
+import rules
+import state as packed
+from batch_rules import BatchBoards, np
+
+# Leaf counts from the initial position, depth 1 first
+INITIAL_PERFT = [6, 36, 190, 1014, 5219, 27332]
+# Leaf counts from bench.MIDGAME_POSITIONS[0], depth 1 first
+MIDGAME_PERFT = [5, 21, 99, 435, 2087]
+
+
+def random_board(rng: random.Random, pits_per_side: int = 6) -> Board:
+    """
+    Build a position with random seed counts, big enough pits for whole laps included.
+
+    Args:
+        rng (random.Random): Random source.
+        pits_per_side (int, optional): Pits per player. Defaults to 6.
+
+    Returns:
+        Board: The position.
+    """
+    board = Board(pits_per_side, 0)
+    for i in range(board.total_pits):
+        board.pits[i].stones = rng.choice((0, 0, 1, 2, 3, rng.randrange(4, 12), rng.randrange(12, 30)))
+    board.scores = [rng.randrange(10), rng.randrange(10)]
+    board.rehash()
+    return board
+
+
+def packed_perft(state: int, player: int, depth: int, pits_per_side: int = 6) -> int:
+    """Count leaves like bench.perft, on packed states."""
+    if depth == 0:
+        return 1
+    if not state & packed.side_mask(0, pits_per_side) or not state & packed.side_mask(1, pits_per_side):
+        return 0
+    return sum(packed_perft(child, 1 - player, depth - 1, pits_per_side)
+               for _, child, _ in packed.children(state, player, pits_per_side))
+
+
+class RulesEquivalenceTest(unittest.TestCase):
+    """The engines find the same legal moves and the same positions after every move."""
+
+    def test_board_and_packed_agree(self):
+        rng = random.Random(0)
+        for pits_per_side in (6, 5, 4):
+            for _ in range(300):
+                board = random_board(rng, pits_per_side)
+                state = packed.pack(board)
+                for player in (0, 1):
+                    expected = {}
+                    for result in rules.generate_moves(board, player):
+                        child = board.clone()
+                        self.assertTrue(rules.apply_move(child, player, result.pit))
+                        expected[result.pit] = (packed.pack(child), result.captured)
+                    actual = {pit: (child, captured)
+                              for pit, child, captured in packed.children(state, player, pits_per_side)}
+                    self.assertEqual(actual, expected)
+                    self.assertEqual(packed.legal_moves(state, player, pits_per_side),
+                                     rules.legal_moves(board, player))
+
+    @unittest.skipIf(np is None, "batch_rules needs NumPy")
+    def test_board_and_batch_agree(self):
+        rng = random.Random(1)
+        boards = [random_board(rng) for _ in range(300)]
+        players = [rng.randrange(2) for _ in boards]
+        mask = BatchBoards.from_boards(boards, players).legal_mask()
+        for i, (board, player) in enumerate(zip(boards, players)):
+            self.assertEqual(list(np.nonzero(mask[i])[0]), rules.legal_moves(board, player))
+
+        for pit in range(12):
+            batch = BatchBoards.from_boards(boards, players)
+            played = batch.play(np.full(len(boards), pit))
+            for i, (board, player) in enumerate(zip(boards, players)):
+                child = board.clone()
+                self.assertEqual(bool(played[i]), rules.apply_move(child, player, pit))
+                if played[i]:
+                    self.assertEqual(batch.pits[i].tolist(), [p.stones for p in child.pits])
+                    self.assertEqual(batch.scores[i].tolist(), child.scores)
+                    self.assertEqual(int(batch.player[i]), 1 - player)
+
+    def test_laps_skip_the_origin_pit(self):
+        board = Board(6, 0)
+        board.pits[0].stones = 23
+        board.pits[6].stones = 1
+        board.rehash()
+        self.assertTrue(rules.apply_move(board, 0, 0))
+        # 23 seeds: two laps over the 11 other pits, the last seed in pit 1
+        self.assertEqual(board.pits[0].stones, 0)
+        self.assertEqual([p.stones for p in board.pits[1:]], [3, 2, 2, 2, 2, 3, 2, 2, 2, 2, 2])
+
+
+class MakeUnmakeTest(unittest.TestCase):
+    """Undo records and tokens restore positions exactly, hash key included."""
+
+    def test_board_round_trip(self):
+        rng = random.Random(2)
+        for _ in range(50):
+            board = random_board(rng)
+            player = rng.randrange(2)
+            history = []
+            for _ in range(rng.randrange(1, 40)):
+                legal = rules.legal_moves(board, player)
+                if not legal:
+                    break
+                before = ([p.stones for p in board.pits], list(board.scores), board.hash_key)
+                undo = rules.make_move(board, player, rng.choice(legal))
+                self.assertIsNotNone(undo)
+                self.assertEqual(board.hash_key, board.clone().rehash())
+                history.append((undo, before))
+                player = 1 - player
+            for undo, before in reversed(history):
+                rules.unmake_move(board, undo)
+                self.assertEqual(([p.stones for p in board.pits], board.scores, board.hash_key), before)
+
+    def test_illegal_move_leaves_the_board_unchanged(self):
+        board = Board()
+        key = board.hash_key
+        self.assertIsNone(rules.make_move(board, 0, 7))
+        self.assertEqual(board.hash_key, key)
+        self.assertEqual([p.stones for p in board.pits], [4] * 12)
+
+    def test_packed_round_trip(self):
+        rng = random.Random(3)
+        for _ in range(50):
+            state = packed.pack(random_board(rng))
+            player = rng.randrange(2)
+            history = []
+            for _ in range(rng.randrange(1, 40)):
+                legal = packed.legal_moves(state, player)
+                if not legal:
+                    break
+                pit = rng.choice(legal)
+                child, undo = packed.make_move(state, player, pit)
+                self.assertEqual(child, packed.apply_move(state, player, pit))
+                history.append((state, undo))
+                state = child
+                player = 1 - player
+            for before, undo in reversed(history):
+                state = packed.unmake_move(state, undo)
+                self.assertEqual(state, before)
+
+
+class PerftTest(unittest.TestCase):
+    """Leaf counts at fixed depth, with clone, in place and on packed states."""
+
+    def test_initial_position(self):
+        for depth, nodes in enumerate(INITIAL_PERFT, 1):
+            self.assertEqual(bench.perft(Board(), 0, depth), nodes)
+            self.assertEqual(bench.perft_inplace(Board(), 0, depth), nodes)
+            self.assertEqual(packed_perft(packed.pack(Board()), 0, depth), nodes)
+
+    def test_midgame_position(self):
+        pits, scores, player = bench.MIDGAME_POSITIONS[0]
+        board = bench.position_board(pits, scores)
+        for depth, nodes in enumerate(MIDGAME_PERFT, 1):
+            self.assertEqual(bench.perft(board, player, depth), nodes)
+            self.assertEqual(bench.perft_inplace(board, player, depth), nodes)
+            self.assertEqual(packed_perft(packed.pack(board), player, depth), nodes)
+
+
+if __name__ == "__main__":
+    unittest.main()
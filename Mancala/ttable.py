@@ -0,0 +1,178 @@
+"""
+ttable.py
+
+This implements the transposition table used by the CPU search.
+Positions are keyed by their Zobrist hash. Every bucket holds two entries:
+a depth-preferred slot that keeps the deepest search seen for that bucket
+and an always-replace slot for the most recent one. Entries live in two
+flat arrays of 64-bit integers, so the table size in memory is fixed.
+The entries can be written to a file and read back (used by solver.py to
+resume long solves).
+"""
+
+import os
+import struct
+from array import array
+from typing import Dict, Optional, Tuple
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+ENTRY_BYTES = 16
+_VALUE_BIAS = 1 << 31
+_NO_MOVE = 0xFF
+FILE_MAGIC = b"OWTT"
+FILE_HEADER = struct.Struct("<4sQ")
+
+
+class TranspositionTable:
+    """
+    A bounded hash table of search results with two-tier buckets.
+
+    Attributes:
+        size_mb (float): Requested memory budget in megabytes.
+        buckets (int): Number of buckets (a power of two).
+        hits (int): Probes that found the position.
+        misses (int): Probes that did not find the position.
+        collisions (int): Misses where the bucket held other positions.
+        stores (int): Number of store calls.
+    """
+
+    def __init__(self, size_mb: float = 16):
+        """
+        Allocate the table.
+
+        Args:
+            size_mb (float, optional): Memory budget in megabytes. Defaults to 16.
+        """
+        self.size_mb = size_mb
+        slots = max(2, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        buckets = 1
+        while buckets * 4 <= slots:
+            buckets *= 2
+        self.buckets = buckets
+        self._mask = buckets - 1
+        self._keys = array('Q', bytes(8 * 2 * buckets))
+        self._data = array('Q', bytes(8 * 2 * buckets))
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    @staticmethod
+    def _pack(depth: int, flag: int, value: int, move: Optional[int]) -> int:
+        """Pack one entry's payload into 64 bits (non zero, so 0 marks an empty slot)."""
+        move_field = _NO_MOVE if move is None else move
+        return (int(value) + _VALUE_BIAS) | (depth << 32) | (flag << 40) | (move_field << 42) | (1 << 50)
+
+    @staticmethod
+    def _unpack(data: int) -> Tuple[int, int, int, Optional[int]]:
+        """Unpack a payload into (depth, flag, value, move)."""
+        move = (data >> 42) & 0xFF
+        return ((data >> 32) & 0xFF, (data >> 40) & 0x3,
+                (data & 0xFFFFFFFF) - _VALUE_BIAS, None if move == _NO_MOVE else move)
+
+    def probe(self, key: int) -> Optional[Tuple[int, int, int, Optional[int]]]:
+        """
+        Look up a position.
+
+        Args:
+            key (int): 64-bit position hash (side to move included).
+
+        Returns:
+            Optional[Tuple[int, int, int, Optional[int]]]: (depth, bound flag, value, best move), or None.
+        """
+        slot = (key & self._mask) << 1
+        keys = self._keys
+        data = self._data
+        for i in (slot, slot + 1):
+            if keys[i] == key and data[i]:
+                self.hits += 1
+                return self._unpack(data[i])
+        self.misses += 1
+        if data[slot] or data[slot + 1]:
+            self.collisions += 1
+        return None
+
+    def store(self, key: int, depth: int, flag: int, value: int, move: Optional[int]) -> None:
+        """
+        Store a search result.
+
+        The depth-preferred slot is replaced when it holds the same position
+        or a shallower search; otherwise the entry goes to the always-replace slot.
+
+        Args:
+            key (int): 64-bit position hash (side to move included).
+            depth (int): Remaining depth the value was searched to.
+            flag (int): EXACT, LOWER or UPPER bound.
+            value (int): The search value.
+            move (Optional[int]): Best move found, if any.
+        """
+        self.stores += 1
+        slot = (key & self._mask) << 1
+        payload = self._pack(min(depth, 0xFF), flag, value, move)
+        deep = self._data[slot]
+        if not deep or self._keys[slot] == key or (deep >> 32) & 0xFF <= depth:
+            self._keys[slot] = key
+            self._data[slot] = payload
+        else:
+            self._keys[slot + 1] = key
+            self._data[slot + 1] = payload
+
+    def clear(self) -> None:
+        """Empty the table and reset the counters."""
+        self._keys = array('Q', bytes(8 * 2 * self.buckets))
+        self._data = array('Q', bytes(8 * 2 * self.buckets))
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+    def save(self, path: str) -> None:
+        """
+        Write every entry to a file (the counters are not saved).
+
+        The file is written next to path first and then renamed, so an
+        interrupted save leaves the previous file intact.
+
+        Args:
+            path (str): Target file path.
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(FILE_HEADER.pack(FILE_MAGIC, self.buckets))
+            self._keys.tofile(f)
+            self._data.tofile(f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        """
+        Replace the entries with those written by save, taking over the saved size.
+
+        Args:
+            path (str): Path of the saved table.
+
+        Raises:
+            ValueError: If the file is not a saved table or is truncated.
+        """
+        with open(path, "rb") as f:
+            magic, buckets = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+            if magic != FILE_MAGIC or buckets & (buckets - 1):
+                raise ValueError(f"{path} is not a saved transposition table.")
+            keys = array('Q')
+            data = array('Q')
+            try:
+                keys.fromfile(f, 2 * buckets)
+                data.fromfile(f, 2 * buckets)
+            except EOFError:
+                raise ValueError(f"{path} is truncated.") from None
+        self.buckets = buckets
+        self._mask = buckets - 1
+        self._keys = keys
+        self._data = data
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+    def counters(self) -> Dict[str, int]:
+        """
+        Return the usage counters.
+
+        Returns:
+            Dict[str, int]: Keys 'hits', 'misses', 'collisions' and 'stores'.
+        """
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions, "stores": self.stores}
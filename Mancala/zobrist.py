@@ -0,0 +1,134 @@
+"""
+zobrist.py
+
+This provides Zobrist hashing for Oware positions.
+Every (pit, seed count) pair, every (player, score) pair and the side to move
+has a fixed 64-bit key. The hash of a position is the XOR of the keys of its
+fields, so a move only XORs out the old and XORs in the new value of each
+field it touches. Keys come from a fixed seed, so hashes are stable between
+runs and can be stored in files.
+"""
+
+from functools import lru_cache
+from typing import List, Sequence
+
+MASK64 = (1 << 64) - 1
+ZOBRIST_SEED = 0x6F77617265
+TABLE_MAX_VALUE = 255
+
+_PIT, _SCORE, _SIDE, _QUIET = 0, 1, 2, 3
+
+
+def _splitmix64(x: int) -> int:
+    """Scramble a 64-bit integer (SplitMix64 finalizer)."""
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def _derive_key(kind: int, index: int, value: int) -> int:
+    """Derive the key of one field value from the fixed seed."""
+    return _splitmix64(ZOBRIST_SEED ^ (kind << 56) ^ (index << 32) ^ value)
+
+
+SIDE_KEY = _derive_key(_SIDE, 0, 1)
+
+
+@lru_cache(maxsize=None)
+def quiet_key(plies_left: int) -> int:
+    """
+    Return the key XORed in for a search state that also depends on a ply counter.
+
+    Args:
+        plies_left (int): The counter (solver.py: plies left without a capture).
+
+    Returns:
+        int: The 64-bit key.
+    """
+    return _derive_key(_QUIET, 0, plies_left)
+
+
+class ZobristKeys:
+    """
+    Key tables for one board geometry.
+
+    Attributes:
+        total_pits (int): Number of pits on the board.
+        pits (List[List[int]]): pits[i][n] is the key of pit i holding n seeds.
+        scores (List[List[int]]): scores[p][n] is the key of player p having n points.
+        side (int): Key XORed in when Player 1 is to move.
+    """
+
+    def __init__(self, total_pits: int):
+        """
+        Build the key tables.
+
+        Args:
+            total_pits (int): Number of pits on the board.
+        """
+        self.total_pits = total_pits
+        values = range(TABLE_MAX_VALUE + 1)
+        self.pits: List[List[int]] = [[_derive_key(_PIT, i, v) for v in values] for i in range(total_pits)]
+        self.scores: List[List[int]] = [[_derive_key(_SCORE, p, v) for v in values] for p in (0, 1)]
+        self.side = SIDE_KEY
+
+    def pit(self, pit_index: int, count: int) -> int:
+        """
+        Return the key of a pit holding count seeds.
+
+        Args:
+            pit_index (int): The index of the pit.
+            count (int): Seeds in the pit.
+
+        Returns:
+            int: The 64-bit key.
+        """
+        if count <= TABLE_MAX_VALUE:
+            return self.pits[pit_index][count]
+        return _derive_key(_PIT, pit_index, count)
+
+    def score(self, player: int, value: int) -> int:
+        """
+        Return the key of a player's score.
+
+        Args:
+            player (int): The player ID (0 or 1).
+            value (int): The score.
+
+        Returns:
+            int: The 64-bit key.
+        """
+        if value <= TABLE_MAX_VALUE:
+            return self.scores[player][value]
+        return _derive_key(_SCORE, player, value)
+
+    def full_key(self, pits: Sequence[int], scores: Sequence[int]) -> int:
+        """
+        Hash a position from scratch.
+
+        Args:
+            pits (Sequence[int]): Seed count of every pit.
+            scores (Sequence[int]): Scores of Player 0 and Player 1.
+
+        Returns:
+            int: The 64-bit hash (side to move not included).
+        """
+        key = self.score(0, scores[0]) ^ self.score(1, scores[1])
+        for i, count in enumerate(pits):
+            key ^= self.pit(i, count)
+        return key
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(total_pits: int) -> ZobristKeys:
+    """
+    Return the shared key tables for a board geometry.
+
+    Args:
+        total_pits (int): Number of pits on the board.
+
+    Returns:
+        ZobristKeys: The cached tables.
+    """
+    return ZobristKeys(total_pits)